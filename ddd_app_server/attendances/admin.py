@@ -1,7 +1,10 @@
 # admin.py
 from django.contrib import admin
 from django.contrib.auth import get_user_model
-from attendances.models import Attendance
+from django.db import transaction
+from attendances.models import Attendance, UserAttendanceCounter, ScheduleAttendanceCounter
+from attendances.counters import refresh_counters
+from sync.tombstones import record_attendance_tombstones
 
 User = get_user_model()
 
@@ -12,3 +15,25 @@ class AttendanceAdmin(admin.ModelAdmin):
     search_fields = ('user__username', 'schedule__title')
     list_filter = ('status', 'method', 'updated_at', 'user', 'schedule') # Filter by schedule's group
     ordering = ('-updated_at',)
+
+    def delete_queryset(self, request, queryset):
+        # Bulk deletes bypass Attendance.delete(), so record the tombstones and refresh the affected counters here
+        rows = list(queryset.values_list('pk', 'user_id', 'schedule_id'))
+        with transaction.atomic():
+            super().delete_queryset(request, queryset)
+            record_attendance_tombstones(rows)
+        refresh_counters(schedule_ids=[row[2] for row in rows], user_ids=[row[1] for row in rows])
+
+
+@admin.register(ScheduleAttendanceCounter)
+class ScheduleAttendanceCounterAdmin(admin.ModelAdmin):
+    list_display = ('schedule', 'attendance_count', 'present_count', 'late_count', 'absent_count', 'exception_count', 'tbd_count', 'updated_at')
+    search_fields = ('schedule__title',)
+    raw_id_fields = ('schedule',)
+
+
+@admin.register(UserAttendanceCounter)
+class UserAttendanceCounterAdmin(admin.ModelAdmin):
+    list_display = ('user', 'cohort', 'attendance_count', 'present_count', 'late_count', 'absent_count', 'exception_count', 'tbd_count', 'updated_at')
+    search_fields = ('user__username',)
+    raw_id_fields = ('user',)
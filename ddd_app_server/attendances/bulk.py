@@ -0,0 +1,85 @@
+# attendances/bulk.py
+"""
+Set-based bulk updates of attendances for moderators.
+
+bulk_update_attendances() reads the targeted rows once, works out which
+ones actually change, and writes them with one UPDATE per distinct target
+value (status 'auto' is resolved per schedule), all in one transaction.
+Counters are refreshed once for the affected schedules and users.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils.timezone import now
+
+from .counters import refresh_counters
+from .models import Attendance
+from .status import classify
+
+MAX_BULK_IDS = 1000
+
+# Per-item outcomes
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+NOT_FOUND = 'not_found'
+BULK_OUTCOMES = (UPDATED, UNCHANGED, NOT_FOUND)
+
+CHANGE_FIELDS = ('status', 'method', 'note')
+
+
+def target_queryset(ids=None, schedule_id=None, team=None):
+    """Attendances selected by a list of ids, or by schedule (optionally narrowed to a team)."""
+    if ids is not None:
+        return Attendance.objects.filter(pk__in=ids)
+    queryset = Attendance.objects.filter(schedule_id=schedule_id)
+    if team:
+        queryset = queryset.filter(user__member_attribute__team=team)
+    return queryset
+
+
+@transaction.atomic
+def bulk_update_attendances(queryset, changes, requested_ids=None):
+    """
+    Applies `changes` (a subset of status/method/note) to the attendances of
+    `queryset`. Returns a list of {'id', 'outcome', 'status'}. When
+    requested_ids is given, the list follows its order and ids that matched
+    no attendance are reported as NOT_FOUND.
+    """
+    current_time = now()
+    rows = list(
+        # Lock only the attendance rows, not the joined schedule (or profile) rows
+        queryset.select_for_update(of=('self',))
+        .order_by('schedule__start_time', 'pk')
+        .values('pk', 'user_id', 'schedule_id', 'schedule__start_time', *CHANGE_FIELDS)
+    )
+
+    results = []
+    groups = defaultdict(list)
+    for row in rows:
+        target = dict(changes)
+        if target.get('status') == 'auto':
+            target['status'] = classify(row['schedule__start_time'], current_time)
+        if all(row[field] == value for field, value in target.items()):
+            results.append({'id': row['pk'], 'outcome': UNCHANGED, 'status': row['status']})
+            continue
+        groups[tuple(sorted(target.items()))].append(row)
+        results.append({'id': row['pk'], 'outcome': UPDATED, 'status': target.get('status', row['status'])})
+
+    for target, group_rows in groups.items():
+        Attendance.objects.filter(pk__in=[row['pk'] for row in group_rows]).update(**dict(target), updated_at=current_time)
+
+    if 'status' in changes and groups:
+        changed_rows = [row for group_rows in groups.values() for row in group_rows]
+        refresh_counters(
+            schedule_ids={row['schedule_id'] for row in changed_rows},
+            user_ids={row['user_id'] for row in changed_rows},
+        )
+
+    if requested_ids is not None:
+        # Report in request order, once per id
+        by_id = {result['id']: result for result in results}
+        results = [
+            by_id.get(attendance_id, {'id': attendance_id, 'outcome': NOT_FOUND, 'status': None})
+            for attendance_id in dict.fromkeys(requested_ids)
+        ]
+    return results
@@ -0,0 +1,140 @@
+# attendances/counters.py
+"""
+Maintenance of the UserAttendanceCounter / ScheduleAttendanceCounter tables.
+
+Single-row changes (Attendance.save/delete) are applied incrementally with F()
+updates inside the caller's transaction. Bulk writes (bulk_create, queryset
+update/delete) call refresh_counters() for the affected keys instead, and
+rebuild_counters() recomputes everything to repair drift.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from schedules.models import Schedule
+from .models import Attendance, AttendanceStatusCounter, UserAttendanceCounter, ScheduleAttendanceCounter
+
+STATUS_COUNT_FIELDS = {
+    'present': 'present_count',
+    'late': 'late_count',
+    'absent': 'absent_count',
+    'exception': 'exception_count',
+    'tbd': 'tbd_count',
+}
+
+
+def _status_deltas(old_status, new_status):
+    deltas = {}
+    if old_status is not None:
+        deltas['attendance_count'] = -1
+        if old_status in STATUS_COUNT_FIELDS:
+            deltas[STATUS_COUNT_FIELDS[old_status]] = -1
+    if new_status is not None:
+        deltas['attendance_count'] = deltas.get('attendance_count', 0) + 1
+        if new_status in STATUS_COUNT_FIELDS:
+            field = STATUS_COUNT_FIELDS[new_status]
+            deltas[field] = deltas.get(field, 0) + 1
+    return {field: delta for field, delta in deltas.items() if delta}
+
+
+def _bump(model, keys, deltas):
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**keys).update(**updates):
+        return
+    try:
+        # First attendance for this key: create the row (a concurrent creator loses on the unique constraint)
+        with transaction.atomic():
+            model.objects.create(**keys, **{field: max(delta, 0) for field, delta in deltas.items()})
+    except IntegrityError:
+        model.objects.filter(**keys).update(**updates)
+
+
+def _schedule_cohort_id(attendance):
+    if Attendance.schedule.is_cached(attendance):
+        return attendance.schedule.cohort_id
+    return Schedule.objects.filter(pk=attendance.schedule_id).values_list('cohort_id', flat=True).first()
+
+
+def record_status_change(attendance, old_status, new_status, created=False):
+    """
+    Applies one attendance transition to the counters.
+    old_status is None for a new row, new_status is None for a deleted row.
+    """
+    if old_status is None and not created and new_status is not None:
+        # Persisted status unknown (deferred or never loaded): recompute instead of guessing
+        refresh_counters(schedule_ids=[attendance.schedule_id], user_ids=[attendance.user_id])
+        return
+
+    deltas = _status_deltas(old_status, new_status)
+    if not deltas:
+        return
+    _bump(ScheduleAttendanceCounter, {'schedule_id': attendance.schedule_id}, deltas)
+    _bump(UserAttendanceCounter, {'user_id': attendance.user_id, 'cohort_id': _schedule_cohort_id(attendance)}, deltas)
+
+
+def _user_counter_rows(attendances):
+    rows = attendances.values('user_id', 'schedule__cohort_id').annotate(**_count_aggregates())
+    return [
+        UserAttendanceCounter(cohort_id=row.pop('schedule__cohort_id'), **row)
+        for row in rows
+    ]
+
+
+def _count_aggregates():
+    aggregates = {'attendance_count': Count('id')}
+    for status, field in STATUS_COUNT_FIELDS.items():
+        aggregates[field] = Count('id', filter=Q(status=status))
+    return aggregates
+
+
+@transaction.atomic
+def refresh_counters(schedule_ids=(), user_ids=()):
+    """Recomputes the counter rows of the given schedules and users from the attendance table."""
+    schedule_ids = set(schedule_ids)
+    user_ids = set(user_ids)
+
+    if schedule_ids:
+        rows = (
+            Attendance.objects.filter(schedule_id__in=schedule_ids)
+            .values('schedule_id')
+            .annotate(**_count_aggregates())
+        )
+        ScheduleAttendanceCounter.objects.filter(schedule_id__in=schedule_ids).delete()
+        ScheduleAttendanceCounter.objects.bulk_create([ScheduleAttendanceCounter(**row) for row in rows])
+
+    if user_ids:
+        rows = _user_counter_rows(Attendance.objects.filter(user_id__in=user_ids))
+        UserAttendanceCounter.objects.filter(user_id__in=user_ids).delete()
+        UserAttendanceCounter.objects.bulk_create(rows)
+
+
+@transaction.atomic
+def rebuild_counters():
+    """Recomputes every counter row. Returns (schedule_rows, user_rows)."""
+    ScheduleAttendanceCounter.objects.all().delete()
+    UserAttendanceCounter.objects.all().delete()
+
+    schedule_rows = Attendance.objects.values('schedule_id').annotate(**_count_aggregates())
+    schedule_counters = ScheduleAttendanceCounter.objects.bulk_create(
+        [ScheduleAttendanceCounter(**row) for row in schedule_rows], batch_size=500
+    )
+    user_counters = UserAttendanceCounter.objects.bulk_create(
+        _user_counter_rows(Attendance.objects.all()), batch_size=500
+    )
+    return len(schedule_counters), len(user_counters)
+
+
+def _sum_counts(queryset):
+    return queryset.aggregate(**{field: Coalesce(Sum(field), 0) for field in AttendanceStatusCounter.COUNT_FIELDS})
+
+
+def counts_for_user(user_id):
+    return _sum_counts(UserAttendanceCounter.objects.filter(user_id=user_id))
+
+
+def counts_for_schedule(schedule_id):
+    return _sum_counts(ScheduleAttendanceCounter.objects.filter(schedule_id=schedule_id))
+
+
+def counts_total():
+    return _sum_counts(ScheduleAttendanceCounter.objects.all())
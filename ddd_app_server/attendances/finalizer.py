@@ -0,0 +1,48 @@
+# attendances/finalizer.py
+"""
+Finalization of attendances after a schedule's late window has closed.
+
+Members who never checked in still have 'tbd' rows. finalize_attendances()
+flips them to 'absent' with one UPDATE per batch of schedules and sets
+Schedule.finalized_at as a watermark, so a schedule is finalized exactly
+once and re-running the job is a no-op.
+
+Rows added to a schedule after it was finalized stay 'tbd': the roster sync
+backfills members who joined the group later into its past schedules too,
+and they were not expected at a session that ended before they joined.
+"""
+from django.db import transaction
+from django.utils.timezone import now
+
+from schedules.models import Schedule
+from .counters import refresh_counters
+from .models import Attendance
+from .status import late_window_closed
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def due_schedules(at=None):
+    """Schedules whose late window has closed by `at` and that are not finalized yet."""
+    return Schedule.objects.filter(finalized_at__isnull=True, start_time__lt=late_window_closed(at))
+
+
+def finalize_attendances(at=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Finalizes every due schedule. Returns (schedule_count, absent_count).
+    """
+    at = at or now()
+    schedule_count = absent_count = 0
+    while True:
+        with transaction.atomic():
+            schedule_ids = list(due_schedules(at).order_by('start_time').values_list('pk', flat=True)[:batch_size])
+            if not schedule_ids:
+                break
+            tbd = Attendance.objects.filter(schedule_id__in=schedule_ids, status='tbd')
+            user_ids = set(tbd.values_list('user_id', flat=True))
+            absent_count += tbd.update(status='absent', updated_at=at)
+            Schedule.objects.filter(pk__in=schedule_ids).update(finalized_at=at)
+            if user_ids:
+                refresh_counters(schedule_ids=schedule_ids, user_ids=user_ids)
+        schedule_count += len(schedule_ids)
+    return schedule_count, absent_count
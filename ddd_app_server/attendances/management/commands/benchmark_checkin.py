@@ -0,0 +1,262 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from common.roles import MODERATOR_GROUP
+from schedules.models import Schedule
+
+STEPS = ('generate', 'attend', 'count')
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    index = max(0, min(len(values) - 1, round(q / 100 * len(values) + 0.5) - 1))
+    return values[index]
+
+
+class InProcessTransport:
+    """Drives the API through the DRF test client; each worker thread uses its own client and DB connection."""
+    name = 'in-process'
+    counts_queries = True
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def client(self):
+        from rest_framework.test import APIClient
+
+        if not hasattr(self._local, 'client'):
+            self._local.client = APIClient(HTTP_HOST='localhost')
+        return self._local.client
+
+    def request(self, method, path, token, body=None):
+        client = self.client()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        with CaptureQueriesContext(connection) as queries:
+            try:
+                response = getattr(client, method)(path, body, format='json')
+            except OperationalError as e:
+                return 500, None, len(queries), str(e)
+        data = response.json() if response.get('Content-Type', '').startswith('application/json') else None
+        return response.status_code, data, len(queries), None
+
+    def close(self):
+        connections.close_all()
+
+
+class HTTPTransport:
+    """Drives a running server over HTTP. The server must use the same database and SECRET_KEY."""
+    name = 'http'
+    counts_queries = False
+
+    def __init__(self, base_url):
+        import requests
+
+        self.base_url = base_url.rstrip('/')
+        self._local = threading.local()
+        self._requests = requests
+
+    def request(self, method, path, token, body=None):
+        if not hasattr(self._local, 'session'):
+            self._local.session = self._requests.Session()
+        try:
+            response = self._local.session.request(
+                method.upper(), self.base_url + path, json=body,
+                headers={'Authorization': f'Bearer {token}'}, timeout=60,
+            )
+        except self._requests.RequestException as e:
+            return 0, None, None, str(e)
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        error = response.text if response.status_code >= 500 else None
+        return response.status_code, data, None, error
+
+    def close(self):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the check-in burst: N members each generate a QR code which a moderator scans "
+        "(attend-with-qr), followed by a count read, at the given concurrency. "
+        "Seeds its own users and schedule in the configured database and removes them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help="Members to seed and check in.")
+        parser.add_argument('--concurrency', type=int, default=8, help="Check-in sequences run in parallel.")
+        parser.add_argument(
+            '--base-url',
+            help="Benchmark a running server (e.g. http://localhost:8000) instead of the in-process test client.",
+        )
+        parser.add_argument('--output', help="JSON result file (default: benchmark-checkin-<timestamp>.json).")
+        parser.add_argument('--keep', action='store_true', help="Keep the seeded users and schedule.")
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--users and --concurrency must be at least 1.")
+
+        transport = HTTPTransport(options['base_url']) if options['base_url'] else InProcessTransport()
+        run_id = uuid.uuid4().hex[:8]
+        self.stdout.write(f"Seeding {options['users']} member(s) (run {run_id})...")
+        seeded = self.seed(run_id, options['users'])
+        try:
+            result = self.run(transport, seeded, options['concurrency'])
+        finally:
+            transport.close()
+            if not options['keep']:
+                self.cleanup(seeded)
+
+        result.update({
+            'run_id': run_id,
+            'started_at': seeded['started_at'].isoformat(),
+            'transport': transport.name,
+            'base_url': options['base_url'],
+            'users': options['users'],
+            'concurrency': options['concurrency'],
+            'database': settings.DATABASES['default']['ENGINE'],
+            'qr_token_mode': settings.QRCODE_TOKEN_MODE,
+        })
+        self.report(result)
+
+        output = options['output'] or f"benchmark-checkin-{seeded['started_at']:%Y%m%d-%H%M%S}.json"
+        with open(output, 'w') as f:
+            json.dump(result, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Saved result to {output}"))
+
+    def seed(self, run_id, count):
+        started_at = now()
+        group = Group.objects.create(name=f'benchmark:{run_id}')
+        moderator = User.objects.create_user(username=f'benchmark-{run_id}-moderator')
+        moderator.groups.add(Group.objects.get_or_create(name=MODERATOR_GROUP)[0])
+        members = []
+        for i in range(count):
+            member = User.objects.create_user(username=f'benchmark-{run_id}-{i}')
+            member.groups.add(group)
+            members.append(member)
+        # Scanned inside the present window (start within 10 minutes), like the real burst
+        schedule = Schedule.objects.create(
+            title=f'benchmark {run_id}',
+            start_time=started_at + timedelta(minutes=5),
+            end_time=started_at + timedelta(hours=2),
+            group=group,
+        )
+        return {
+            'started_at': started_at,
+            'group': group,
+            'schedule': schedule,
+            'moderator_token': str(RefreshToken.for_user(moderator).access_token),
+            'member_tokens': [str(RefreshToken.for_user(member).access_token) for member in members],
+            'users': [moderator, *members],
+        }
+
+    def cleanup(self, seeded):
+        seeded['schedule'].delete()
+        User.objects.filter(pk__in=[user.pk for user in seeded['users']]).delete()
+        seeded['group'].delete()
+
+    def run(self, transport, seeded, concurrency):
+        schedule_id = str(seeded['schedule'].pk)
+        moderator_token = seeded['moderator_token']
+        samples = {step: [] for step in STEPS}
+        errors = []
+        lock = threading.Lock()
+
+        def record(step, started, response):
+            status_code, data, queries, error = response
+            with lock:
+                samples[step].append({
+                    'ms': (time.perf_counter() - started) * 1000,
+                    'status': status_code,
+                    'queries': queries,
+                })
+                if error or status_code >= 400:
+                    errors.append({'step': step, 'status': status_code, 'error': (error or '')[:500]})
+            return data if status_code < 400 else None
+
+        def check_in(member_token):
+            started = time.perf_counter()
+            data = record('generate', started, transport.request('post', '/api/v1/qrcodes/', member_token))
+            if data is None:
+                return
+            started = time.perf_counter()
+            body = {'qr_code_value': data['data']['qr_string'], 'schedule_id': schedule_id}
+            record('attend', started, transport.request('post', '/api/v1/attendances/attend-with-qr/', moderator_token, body))
+            started = time.perf_counter()
+            record('count', started, transport.request('get', f'/api/v1/attendances/count/?schedule_id={schedule_id}', moderator_token))
+
+        def worker(tokens):
+            try:
+                for member_token in tokens:
+                    check_in(member_token)
+            finally:
+                # In-process workers own a DB connection per thread
+                if transport.counts_queries:
+                    connection.close()
+
+        member_tokens = seeded['member_tokens']
+        batches = [member_tokens[i::concurrency] for i in range(concurrency)]
+        wall_started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(worker, batches))
+        wall_seconds = time.perf_counter() - wall_started
+
+        steps = {}
+        for step, step_samples in samples.items():
+            latencies = sorted(sample['ms'] for sample in step_samples)
+            queries = [sample['queries'] for sample in step_samples if sample['queries'] is not None]
+            steps[step] = {
+                'requests': len(step_samples),
+                'errors': sum(1 for sample in step_samples if sample['status'] >= 400 or sample['status'] == 0),
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99),
+                'max_ms': latencies[-1] if latencies else None,
+                'queries_per_request': sum(queries) / len(queries) if queries else None,
+            }
+
+        completed = sum(1 for sample in samples['count'] if sample['status'] < 400)
+        requests_total = sum(step['requests'] for step in steps.values())
+        return {
+            'wall_seconds': wall_seconds,
+            'check_ins_completed': completed,
+            'check_ins_per_second': completed / wall_seconds if wall_seconds else None,
+            'requests_per_second': requests_total / wall_seconds if wall_seconds else None,
+            'database_locked_errors': sum(1 for error in errors if 'database is locked' in error['error']),
+            'steps': steps,
+            'errors': errors[:50],
+        }
+
+    def report(self, result):
+        self.stdout.write(
+            f"{result['check_ins_completed']}/{result['users']} check-ins in {result['wall_seconds']:.2f}s "
+            f"({result['check_ins_per_second']:.1f} check-ins/s, {result['requests_per_second']:.1f} req/s, "
+            f"concurrency {result['concurrency']}, {result['transport']})"
+        )
+        for step, stats in result['steps'].items():
+            if not stats['requests']:
+                continue
+            queries = f"{stats['queries_per_request']:.1f}" if stats['queries_per_request'] is not None else '-'
+            self.stdout.write(
+                f"  {step:<9} n={stats['requests']:<5} errors={stats['errors']:<4} "
+                f"p50={stats['p50_ms']:.1f}ms p95={stats['p95_ms']:.1f}ms p99={stats['p99_ms']:.1f}ms "
+                f"queries/req={queries}"
+            )
+        locked = result['database_locked_errors']
+        style = self.style.ERROR if locked else self.style.SUCCESS
+        self.stdout.write(style(f"  'database is locked' errors: {locked}"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from attendances.finalizer import DEFAULT_BATCH_SIZE, due_schedules, finalize_attendances
+
+
+class Command(BaseCommand):
+    help = "Mark the remaining 'tbd' attendances of schedules whose late window has closed as 'absent'."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Schedules finalized per transaction.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many schedules are due.")
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(f"{due_schedules().count()} schedule(s) would be finalized.")
+            return
+
+        schedule_count, absent_count = finalize_attendances(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Finalized {schedule_count} schedule(s), marked {absent_count} attendance(s) as absent."
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from attendances.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-schedule and per-(user, cohort) attendance counter tables from the attendance records."
+
+    def handle(self, *args, **options):
+        schedule_rows, user_rows = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {schedule_rows} schedule counter(s) and {user_rows} user counter(s)."
+        ))
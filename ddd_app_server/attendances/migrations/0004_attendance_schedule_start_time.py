@@ -0,0 +1,41 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:11
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_schedule_start_time(apps, schema_editor):
+    Attendance = apps.get_model('attendances', 'Attendance')
+    Schedule = apps.get_model('schedules', 'Schedule')
+    Attendance.objects.update(
+        schedule_start_time=Subquery(Schedule.objects.filter(pk=OuterRef('schedule_id')).values('start_time')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendances', '0003_alter_attendance_status'),
+        ('profiles', '0004_remove_profile_cohort_id'),
+        ('schedules', '0005_schedule_cohort_alter_schedule_group'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='schedule_start_time',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_schedule_start_time, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='attendance',
+            name='schedule_start_time',
+            field=models.DateTimeField(editable=False, help_text="Copy of schedule.start_time, kept in sync on schedule save (keyset pagination)."),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['schedule_start_time', 'id'], name='attendance_start_id_idx'),
+        ),
+    ]
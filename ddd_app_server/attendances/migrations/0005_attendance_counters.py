@@ -0,0 +1,77 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+STATUSES = ('present', 'late', 'absent', 'exception', 'tbd')
+
+
+def populate_counters(apps, schema_editor):
+    Attendance = apps.get_model('attendances', 'Attendance')
+    ScheduleAttendanceCounter = apps.get_model('attendances', 'ScheduleAttendanceCounter')
+    UserAttendanceCounter = apps.get_model('attendances', 'UserAttendanceCounter')
+
+    aggregates = {'attendance_count': Count('id')}
+    for status in STATUSES:
+        aggregates[f'{status}_count'] = Count('id', filter=Q(status=status))
+
+    ScheduleAttendanceCounter.objects.bulk_create(
+        [ScheduleAttendanceCounter(**row) for row in Attendance.objects.values('schedule_id').annotate(**aggregates)],
+        batch_size=500,
+    )
+    user_rows = Attendance.objects.values('user_id', 'schedule__cohort_id').annotate(**aggregates)
+    UserAttendanceCounter.objects.bulk_create(
+        [UserAttendanceCounter(cohort_id=row.pop('schedule__cohort_id'), **row) for row in user_rows],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendances', '0004_attendance_schedule_start_time'),
+        ('profiles', '0005_memberattribute'),
+        ('schedules', '0006_schedule_schedule_start_time_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleAttendanceCounter',
+            fields=[
+                ('attendance_count', models.IntegerField(default=0)),
+                ('present_count', models.IntegerField(default=0)),
+                ('late_count', models.IntegerField(default=0)),
+                ('absent_count', models.IntegerField(default=0)),
+                ('exception_count', models.IntegerField(default=0)),
+                ('tbd_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('schedule', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='attendance_counter', serialize=False, to='schedules.schedule')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='UserAttendanceCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attendance_count', models.IntegerField(default=0)),
+                ('present_count', models.IntegerField(default=0)),
+                ('late_count', models.IntegerField(default=0)),
+                ('absent_count', models.IntegerField(default=0)),
+                ('exception_count', models.IntegerField(default=0)),
+                ('tbd_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cohort', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attendance_counters', to='profiles.cohort')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'cohort'), name='unique_user_cohort_counter'), models.UniqueConstraint(condition=models.Q(('cohort__isnull', True)), fields=('user',), name='unique_user_null_cohort_counter')],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
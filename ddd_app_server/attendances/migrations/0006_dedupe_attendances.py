@@ -0,0 +1,103 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:23
+
+from collections import defaultdict
+
+from django.db import migrations, transaction
+from django.db.models import Count, Q
+
+BATCH_SIZE = 500
+STATUSES = ('present', 'late', 'absent', 'exception', 'tbd')
+MERGED_FIELDS = ('method', 'note', 'cohort_id')
+
+
+def _keep_rank(attendance):
+    # A real mark beats 'tbd'; among equals the most recently changed row wins
+    return (attendance.status != 'tbd', attendance.updated_at)
+
+
+def _refresh_counters(apps, db_alias, schedule_ids, user_ids):
+    Attendance = apps.get_model('attendances', 'Attendance')
+    ScheduleAttendanceCounter = apps.get_model('attendances', 'ScheduleAttendanceCounter')
+    UserAttendanceCounter = apps.get_model('attendances', 'UserAttendanceCounter')
+
+    aggregates = {'attendance_count': Count('id')}
+    for status in STATUSES:
+        aggregates[f'{status}_count'] = Count('id', filter=Q(status=status))
+
+    attendances = Attendance.objects.using(db_alias)
+    schedule_rows = attendances.filter(schedule_id__in=schedule_ids).values('schedule_id').annotate(**aggregates)
+    ScheduleAttendanceCounter.objects.using(db_alias).filter(schedule_id__in=schedule_ids).delete()
+    ScheduleAttendanceCounter.objects.using(db_alias).bulk_create(
+        [ScheduleAttendanceCounter(**row) for row in schedule_rows]
+    )
+
+    user_rows = attendances.filter(user_id__in=user_ids).values('user_id', 'schedule__cohort_id').annotate(**aggregates)
+    UserAttendanceCounter.objects.using(db_alias).filter(user_id__in=user_ids).delete()
+    UserAttendanceCounter.objects.using(db_alias).bulk_create(
+        [UserAttendanceCounter(cohort_id=row.pop('schedule__cohort_id'), **row) for row in user_rows]
+    )
+
+
+def dedupe_attendances(apps, schema_editor):
+    """
+    Merges duplicate (user, schedule) attendances into a single row.
+
+    Works in batches of BATCH_SIZE keys, each in its own short transaction, so
+    the table is never locked for the whole pass. The kept row inherits the
+    method/note/cohort of a discarded duplicate when it has none itself.
+    """
+    Attendance = apps.get_model('attendances', 'Attendance')
+    db_alias = schema_editor.connection.alias
+
+    duplicate_keys = list(
+        Attendance.objects.using(db_alias)
+        .values('user_id', 'schedule_id')
+        .annotate(rows=Count('id'))
+        .filter(rows__gt=1)
+        .values_list('user_id', 'schedule_id')
+    )
+
+    for start in range(0, len(duplicate_keys), BATCH_SIZE):
+        batch = set(duplicate_keys[start:start + BATCH_SIZE])
+        user_ids = {user_id for user_id, _ in batch}
+        schedule_ids = {schedule_id for _, schedule_id in batch}
+
+        with transaction.atomic(using=db_alias):
+            groups = defaultdict(list)
+            candidates = Attendance.objects.using(db_alias).filter(user_id__in=user_ids, schedule_id__in=schedule_ids)
+            for attendance in candidates.select_for_update():
+                if (attendance.user_id, attendance.schedule_id) in batch:
+                    groups[(attendance.user_id, attendance.schedule_id)].append(attendance)
+
+            discarded_ids = []
+            for rows in groups.values():
+                rows.sort(key=_keep_rank, reverse=True)
+                keeper, duplicates = rows[0], rows[1:]
+
+                merged_fields = []
+                for field in MERGED_FIELDS:
+                    if getattr(keeper, field):
+                        continue
+                    value = next((getattr(row, field) for row in duplicates if getattr(row, field)), None)
+                    if value:
+                        setattr(keeper, field, value)
+                        merged_fields.append(field)
+                if merged_fields:
+                    keeper.save(update_fields=merged_fields)
+                discarded_ids.extend(row.pk for row in duplicates)
+
+            Attendance.objects.using(db_alias).filter(pk__in=discarded_ids).delete()
+            _refresh_counters(apps, db_alias, schedule_ids, user_ids)
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own; see dedupe_attendances
+    atomic = False
+
+    dependencies = [
+        ('attendances', '0005_attendance_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_attendances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:23
+
+from importlib import import_module
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def dedupe_attendances(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        # Block writes to the table until the constraint exists (reads continue)
+        table = schema_editor.quote_name(apps.get_model('attendances', 'Attendance')._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE')
+    # Sweep up duplicates written while 0006 was running.
+    import_module('attendances.migrations.0006_dedupe_attendances').dedupe_attendances(apps, schema_editor)
+    if connection.vendor == 'postgresql':
+        # The sweep may update FKs (cohort); fire the deferred FK checks now, or the
+        # ALTER TABLE below fails on the pending trigger events
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendances', '0006_dedupe_attendances'),
+        ('profiles', '0005_memberattribute'),
+        ('schedules', '0008_schedule_start_end_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_attendances, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='attendance',
+            constraint=models.UniqueConstraint(fields=('user', 'schedule'), name='attendance_unique_user_schedule'),
+        ),
+    ]
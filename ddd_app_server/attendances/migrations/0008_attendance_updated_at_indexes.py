@@ -0,0 +1,25 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendances', '0007_attendance_unique_user_schedule'),
+        ('profiles', '0005_memberattribute'),
+        ('schedules', '0010_schedule_updated_at_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['user', 'updated_at'], name='attendance_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['updated_at'], name='attendance_updated_idx'),
+        ),
+    ]
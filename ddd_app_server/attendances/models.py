@@ -1,6 +1,6 @@
 # attendances/models.py
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from schedules.models import Schedule
 from profiles.models import Cohort
@@ -22,11 +22,112 @@ class Attendance(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='attendances')
     schedule = models.ForeignKey(Schedule, on_delete=models.CASCADE, related_name='attendances')
+    schedule_start_time = models.DateTimeField(editable=False, help_text="Copy of schedule.start_time, kept in sync on schedule save (keyset pagination).")
     status = models.CharField(max_length=10, choices=ATTENDANCE_STATUS_CHOICES, default='tbd')
     updated_at = models.DateTimeField(auto_now=True)
     method = models.CharField(max_length=10, choices=METHOD_CHOICES, null=True, blank=True)
     note = models.TextField(blank=True, null=True)
     cohort = models.ForeignKey(Cohort, on_delete=models.SET_NULL, null=True, blank=True, related_name='attendances')
 
+    class Meta:
+        constraints = [
+            # One attendance per user and schedule; also backs the per-user lookups
+            models.UniqueConstraint(fields=['user', 'schedule'], name='attendance_unique_user_schedule'),
+        ]
+        indexes = [
+            # Delta sync: a member's / everyone's rows changed since a watermark
+            models.Index(fields=['user', 'updated_at'], name='attendance_user_updated_idx'),
+            models.Index(fields=['updated_at'], name='attendance_updated_idx'),
+            # Keyset pagination of the attendance list seeks on (schedule_start_time, id)
+            models.Index(fields=['schedule_start_time', 'id'], name='attendance_start_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user} - {self.schedule} ({self.status})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the persisted values so save() can tell what changed
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if value is not models.DEFERRED
+        }
+        return instance
+
+    def _lock_stored_status(self, using):
+        """
+        Locks the row and returns its stored status (None if there is no row).
+        The in-memory status may be stale, so concurrent writers to the same
+        row must take their counter deltas from the row, one after another.
+        """
+        stored = Attendance.objects.db_manager(using).select_for_update().filter(pk=self.pk)
+        return stored.values_list('status', flat=True).first()
+
+    def save(self, *args, **kwargs):
+        from .counters import record_status_change
+
+        adding = self._state.adding
+        loaded_values = getattr(self, '_loaded_values', {})
+        if adding or loaded_values.get('schedule_id', self.schedule_id) != self.schedule_id:
+            self.schedule_start_time = self.schedule.start_time
+        with transaction.atomic(using=kwargs.get('using')):
+            old_status = None if adding else self._lock_stored_status(kwargs.get('using'))
+            super().save(*args, **kwargs)
+            record_status_change(self, old_status, self.status, created=adding)
+        self._loaded_values = {**loaded_values, 'schedule_id': self.schedule_id}
+
+    def delete(self, *args, **kwargs):
+        from .counters import record_status_change
+        from sync.tombstones import record_attendance_tombstones
+
+        with transaction.atomic(using=kwargs.get('using')):
+            row = (self.pk, self.user_id, self.schedule_id)
+            old_status = self._lock_stored_status(kwargs.get('using'))
+            result = super().delete(*args, **kwargs)
+            # A concurrent delete got there first: nothing left to count
+            if old_status is not None:
+                record_status_change(self, old_status, None)
+                record_attendance_tombstones([row])
+        return result
+
+
+class AttendanceStatusCounter(models.Model):
+    """
+    Materialized per-status attendance counts, maintained by attendances.counters.
+    Field names match AttendanceCountSerializer.
+    """
+    attendance_count = models.IntegerField(default=0)
+    present_count = models.IntegerField(default=0)
+    late_count = models.IntegerField(default=0)
+    absent_count = models.IntegerField(default=0)
+    exception_count = models.IntegerField(default=0)
+    tbd_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    COUNT_FIELDS = ('attendance_count', 'present_count', 'late_count', 'absent_count', 'exception_count', 'tbd_count')
+
+    class Meta:
+        abstract = True
+
+
+class UserAttendanceCounter(AttendanceStatusCounter):
+    """Counts per (user, schedule cohort). Schedules without a cohort are counted under cohort=NULL."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='attendance_counters')
+    cohort = models.ForeignKey(Cohort, on_delete=models.CASCADE, null=True, blank=True, related_name='attendance_counters')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'cohort'], name='unique_user_cohort_counter'),
+            models.UniqueConstraint(fields=['user'], condition=models.Q(cohort__isnull=True), name='unique_user_null_cohort_counter'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.cohort} ({self.attendance_count})"
+
+
+class ScheduleAttendanceCounter(AttendanceStatusCounter):
+    """Counts per schedule."""
+    schedule = models.OneToOneField(Schedule, on_delete=models.CASCADE, primary_key=True, related_name='attendance_counter')
+
+    def __str__(self):
+        return f"{self.schedule} ({self.attendance_count})"
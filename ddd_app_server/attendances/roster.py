@@ -0,0 +1,174 @@
+# attendances/roster.py
+"""
+Set-based reconciliation of attendance rosters.
+
+A schedule's roster is the members of its group, minus staff and
+moderators (who run the sessions). The helpers here compute the rows to add
+and remove with anti-joins and write them with bulk statements, so the number
+of queries does not grow with the size of the group.
+
+Group membership changes are not reconciled one m2m call at a time:
+schedule_user_sync() collects the affected users (and the groups they
+left) for the current transaction and sync_user_rosters() runs once for
+all of them on commit.
+"""
+import logging
+import threading
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
+
+from common.roles import MODERATOR_GROUP
+from sync.tombstones import record_attendance_tombstones
+from .counters import refresh_counters
+from .models import Attendance
+
+logger = logging.getLogger(__name__)
+
+Membership = User.groups.through
+
+# Users whose group membership changed in the current transaction (per thread / greenlet)
+_pending = threading.local()
+
+
+def eligible_users():
+    """Users that get attendance records: everyone except staff and moderators."""
+    return User.objects.exclude(Q(is_staff=True) | Q(groups__name=MODERATOR_GROUP))
+
+
+@transaction.atomic
+def sync_schedule_roster(schedule, remove=True):
+    """
+    Makes the schedule's attendances match its group's members.
+    Members without a record get a 'tbd' one, records of users who are no
+    longer in the group are deleted unless remove=False (existing
+    staff/moderator records are kept).
+    Returns (added_user_ids, removed_user_ids).
+    """
+    stale_rows = []
+    if remove:
+        stale = Attendance.objects.filter(schedule=schedule)
+        if schedule.group_id:
+            stale = stale.exclude(user__groups=schedule.group_id)
+        stale_rows = list(stale.values_list('pk', 'user_id', 'schedule_id'))
+    removed_user_ids = [user_id for _, user_id, _ in stale_rows]
+    if stale_rows:
+        Attendance.objects.filter(pk__in=[pk for pk, _, _ in stale_rows]).delete()
+        record_attendance_tombstones(stale_rows)
+
+    added_user_ids = []
+    if schedule.group_id:
+        added_user_ids = list(
+            eligible_users()
+            .filter(groups=schedule.group_id)
+            .exclude(attendances__schedule=schedule)
+            .values_list('pk', flat=True)
+        )
+        Attendance.objects.bulk_create(
+            [
+                Attendance(user_id=user_id, schedule=schedule, schedule_start_time=schedule.start_time, status='tbd')
+                for user_id in added_user_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+    if added_user_ids or removed_user_ids:
+        refresh_counters(schedule_ids=[schedule.pk], user_ids=[*added_user_ids, *removed_user_ids])
+    return added_user_ids, removed_user_ids
+
+
+def sync_schedule_rosters(schedules, remove=True):
+    """
+    Runs sync_schedule_roster() for each schedule, one short transaction per
+    schedule. Returns the number of created records.
+    """
+    created = 0
+    for schedule in schedules:
+        added_user_ids, _ = sync_schedule_roster(schedule, remove=remove)
+        created += len(added_user_ids)
+    return created
+
+
+@transaction.atomic
+def sync_user_rosters(user_ids, removed_group_ids=None):
+    """
+    Makes the attendances of the given users match the schedules of their
+    current groups. Members without a record get a 'tbd' one (staff and
+    moderators excepted). Records are only deleted for the schedules of
+    groups a user left: removed_group_ids maps a user id to those group ids.
+    Records on other schedules (group-less schedules, hand-made or QR
+    records) are never touched. Returns (created_count, deleted_count).
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return 0, 0
+
+    # Records on the schedules of groups the user left, unless the user is (again) a member
+    users_by_group = {}
+    for user_id, group_ids in (removed_group_ids or {}).items():
+        for group_id in group_ids:
+            users_by_group.setdefault(group_id, set()).add(user_id)
+    stale_pairs = []
+    if users_by_group:
+        left_groups = Q()
+        for group_id, group_user_ids in users_by_group.items():
+            left_groups |= Q(schedule__group_id=group_id, user_id__in=group_user_ids)
+        stale = (
+            Attendance.objects.filter(left_groups)
+            .exclude(Exists(Membership.objects.filter(user_id=OuterRef('user_id'), group_id=OuterRef('schedule__group_id'))))
+        )
+        stale_pairs = list(stale.values_list('pk', 'user_id', 'schedule_id'))
+    if stale_pairs:
+        Attendance.objects.filter(pk__in=[pk for pk, _, _ in stale_pairs]).delete()
+        record_attendance_tombstones(stale_pairs)
+
+    # (schedule, member) pairs of the users' groups that have no record yet
+    missing_rows = list(
+        Membership.objects.filter(user__in=eligible_users().filter(pk__in=user_ids), group__schedules__isnull=False)
+        .annotate(schedule_id=F('group__schedules__id'), schedule_start_time=F('group__schedules__start_time'))
+        .exclude(Exists(Attendance.objects.filter(user_id=OuterRef('user_id'), schedule_id=OuterRef('schedule_id'))))
+        .values_list('user_id', 'schedule_id', 'schedule_start_time')
+        .distinct()
+    )
+    Attendance.objects.bulk_create(
+        [
+            Attendance(user_id=user_id, schedule_id=schedule_id, schedule_start_time=start_time, status='tbd')
+            for user_id, schedule_id, start_time in missing_rows
+        ],
+        ignore_conflicts=True,
+    )
+    missing_pairs = [(user_id, schedule_id) for user_id, schedule_id, _ in missing_rows]
+
+    changed = [(user_id, schedule_id) for _, user_id, schedule_id in stale_pairs] + missing_pairs
+    if changed:
+        refresh_counters(
+            schedule_ids={schedule_id for _, schedule_id in changed},
+            user_ids={user_id for user_id, _ in changed},
+        )
+    return len(missing_pairs), len(stale_pairs)
+
+
+def schedule_user_sync(user_ids, removed_group_ids=()):
+    """
+    Queues the users for sync_user_rosters() when the current transaction
+    commits (immediately in autocommit mode), so that several membership
+    changes in one transaction are reconciled together. removed_group_ids
+    are the groups the users left.
+    """
+    pending = getattr(_pending, 'removed_group_ids', None)
+    if pending is None:
+        pending = _pending.removed_group_ids = {}
+    for user_id in user_ids:
+        pending.setdefault(user_id, set()).update(removed_group_ids)
+    # Registered on every call: a callback registered inside a rolled back savepoint is dropped
+    transaction.on_commit(_flush_pending)
+
+
+def _flush_pending():
+    removed_group_ids = getattr(_pending, 'removed_group_ids', None)
+    if not removed_group_ids:
+        return
+    _pending.removed_group_ids = {}
+    created, deleted = sync_user_rosters(removed_group_ids.keys(), removed_group_ids)
+    logger.info(f"Synced attendance for {len(removed_group_ids)} user(s): created {created}, deleted {deleted}.")
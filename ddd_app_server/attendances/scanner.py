@@ -0,0 +1,185 @@
+# attendances/scanner.py
+"""
+Offline scanner support for moderators' check-in devices.
+
+build_snapshot() returns a compact, versioned roster of a schedule together
+with the QR codes that are still usable, so the device can recognise members
+while the network is down. apply_scans() takes the timestamped scans the
+device collected and applies them in a single transaction, judging each scan
+at the time it was taken and reporting a result per item.
+"""
+import hashlib
+import uuid
+from datetime import timedelta
+
+from django.core import signing
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.timezone import now
+
+from qrcodes import tokens as qr_tokens
+from qrcodes.models import QRLog
+from .counters import refresh_counters
+from .models import Attendance
+from .status import classify
+
+MAX_BATCH_SIZE = 500
+# Scans stamped later than this past the server clock are rejected
+SCAN_CLOCK_SKEW = timedelta(minutes=1)
+
+# Per-scan results
+RECORDED = 'recorded'
+ALREADY_RECORDED = 'already_recorded'
+DUPLICATE = 'duplicate'
+INVALID = 'invalid'
+NOT_FOUND = 'not_found'
+EXPIRED = 'expired'
+USED = 'used'
+NOT_ON_ROSTER = 'not_on_roster'
+SCAN_RESULTS = (RECORDED, ALREADY_RECORDED, DUPLICATE, INVALID, NOT_FOUND, EXPIRED, USED, NOT_ON_ROSTER)
+
+
+def roster_version(schedule):
+    """Changes whenever the schedule, its roster, an attendance on it or a roster member's name/team changes."""
+    state = Attendance.objects.filter(schedule=schedule).aggregate(
+        count=Count('id'),
+        attendance=Max('updated_at'),
+        profile=Max('user__profile__updated_at'),
+        member_attribute=Max('user__member_attribute__updated_at'),
+    )
+    key = repr((schedule.pk, schedule.updated_at, *state.values()))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def build_snapshot(schedule):
+    current_time = now()
+    roster = list(
+        Attendance.objects.filter(schedule=schedule)
+        .order_by('user_id')
+        .values('id', 'user_id', 'status', 'method', 'user__profile__name', 'user__member_attribute__team')
+    )
+    qr_codes = list(
+        QRLog.objects.filter(
+            user_id__in=[row['user_id'] for row in roster],
+            decoded_at__isnull=True,
+            expires_at__gt=current_time,
+        )
+        .order_by('expires_at')
+        .values('id', 'user_id', 'expires_at')
+    )
+    return {
+        'schedule': schedule,
+        'version': roster_version(schedule),
+        'generated_at': current_time,
+        'roster': [
+            {
+                'attendance_id': row['id'],
+                'user_id': row['user_id'],
+                'name': row['user__profile__name'] or '',
+                'team': row['user__member_attribute__team'] or '',
+                'status': row['status'],
+                'method': row['method'],
+            }
+            for row in roster
+        ],
+        # Signed tokens (QRCODE_TOKEN_MODE) carry the user id themselves and are verified on upload
+        'qr_codes': qr_codes,
+    }
+
+
+def _resolve(value, scanned_at, logs):
+    """Returns (result, user_id, consume) for one scanned value; result is None when usable."""
+    if qr_tokens.is_token(value):
+        try:
+            token = qr_tokens.read_token(value, at=scanned_at)
+        except signing.SignatureExpired:
+            return EXPIRED, None, None
+        except signing.BadSignature:
+            return INVALID, None, None
+        return None, token.user_id, lambda: qr_tokens.consume_nonce(token, at=scanned_at)
+
+    try:
+        qr_log = logs.get(uuid.UUID(value))
+    except ValueError:
+        return INVALID, None, None
+    if qr_log is None:
+        return NOT_FOUND, None, None
+    if scanned_at >= qr_log.expires_at:
+        return EXPIRED, qr_log.user_id, None
+    # Consumed with the scan time, so decoded_at records when the member actually checked in
+    return None, qr_log.user_id, lambda: QRLog.objects.consume(qr_log.pk, at=scanned_at)
+
+
+def apply_scans(schedule, scans):
+    """
+    Applies [{'qr_code_value': str, 'scanned_at': datetime}, ...] to the
+    schedule's attendances. Scans are processed in scan order, so a member's
+    earliest scan wins. Re-uploading a batch is safe: scans that were already
+    applied report ALREADY_RECORDED.
+
+    Returns a list of {'index', 'result', 'user_id', 'attendance_id', 'status'}
+    in the order of `scans`.
+    """
+    current_time = now()
+    results = [None] * len(scans)
+
+    log_ids = []
+    for scan in scans:
+        value = scan['qr_code_value']
+        if not qr_tokens.is_token(value):
+            try:
+                log_ids.append(uuid.UUID(value))
+            except ValueError:
+                pass
+    logs = QRLog.objects.in_bulk(log_ids)
+    roster = {attendance.user_id: attendance for attendance in Attendance.objects.filter(schedule=schedule)}
+
+    def result(index, code, user_id=None, attendance=None):
+        results[index] = {
+            'index': index,
+            'result': code,
+            'user_id': user_id,
+            'attendance_id': attendance.pk if attendance else None,
+            'status': attendance.status if attendance else None,
+        }
+
+    seen_values = set()
+    checked_in = {}
+    with transaction.atomic():
+        for index, scan in sorted(enumerate(scans), key=lambda item: item[1]['scanned_at']):
+            value, scanned_at = scan['qr_code_value'], scan['scanned_at']
+            if scanned_at > current_time + SCAN_CLOCK_SKEW:
+                result(index, INVALID)
+                continue
+            if value in seen_values:
+                result(index, DUPLICATE)
+                continue
+            seen_values.add(value)
+
+            code, user_id, consume = _resolve(value, scanned_at, logs)
+            attendance = roster.get(user_id)
+            if code is not None:
+                result(index, code, user_id, attendance)
+                continue
+            if attendance is None:
+                result(index, NOT_ON_ROSTER, user_id)
+                continue
+            if user_id in checked_in:
+                result(index, DUPLICATE, user_id, attendance)
+                continue
+            if not consume():
+                # A retried upload finds its codes consumed by the attempt that already recorded them
+                already = attendance.method == 'qr' and attendance.status != 'tbd'
+                result(index, ALREADY_RECORDED if already else USED, user_id, attendance)
+                continue
+
+            attendance.status = classify(schedule.start_time, scanned_at)
+            attendance.method = 'qr'
+            attendance.updated_at = current_time
+            checked_in[user_id] = attendance
+            result(index, RECORDED, user_id, attendance)
+
+        if checked_in:
+            Attendance.objects.bulk_update(checked_in.values(), ['status', 'method', 'updated_at'])
+            refresh_counters(schedule_ids=[schedule.pk], user_ids=checked_in.keys())
+    return results
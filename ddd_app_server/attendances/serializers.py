@@ -2,9 +2,11 @@ from rest_framework import serializers
 from .models import Attendance
 from profiles.models import Profile
 from schedules.models import Schedule
-from profiles.serializers import ProfileSummarySerializer
-from datetime import timedelta
-from django.utils.timezone import now
+from profiles.serializers import ProfileSummarySerializer, PROFILE_SUMMARY_PREFETCH
+from common.serializers import Nested, PrefetchListSerializer, SparseFieldsetMixin
+from .bulk import MAX_BULK_IDS
+from .scanner import MAX_BATCH_SIZE
+from .status import classify
 
 
 class ScheduleSummarySerializer(serializers.ModelSerializer):
@@ -14,14 +16,25 @@ class ScheduleSummarySerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class AttendanceSerializer(serializers.ModelSerializer):
+class AttendanceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     profile_summary = serializers.SerializerMethodField()
     schedule_summary = serializers.SerializerMethodField()
 
+    prefetch_lookups = {
+        'profile_summary': PROFILE_SUMMARY_PREFETCH,
+        'schedule_summary': ('schedule',),
+    }
+    # Read-only fast path, see CompiledRowMapper
+    compiled_fields = {
+        'profile_summary': Nested('user__profile', ProfileSummarySerializer),
+        'schedule_summary': Nested('schedule', ScheduleSummarySerializer),
+    }
+
     class Meta:
         model = Attendance
         fields = ['id', 'profile_summary', 'schedule_summary', 'updated_at', 'status', 'method', 'note']
         read_only_fields = ['id', 'profile_summary', 'schedule_summary', 'updated_at']
+        list_serializer_class = PrefetchListSerializer
 
     def get_profile_summary(self, obj):
         profile = getattr(obj.user, 'profile', None)
@@ -50,17 +63,7 @@ class AttendanceSerializer(serializers.ModelSerializer):
 
         # If status is 'auto', determine the status based on time
         if status_value == 'auto':
-            current_time = now()
-            schedule = instance.schedule
-            start_time = schedule.start_time
-            if start_time - timedelta(hours=1) <= current_time <= start_time + timedelta(minutes=10):
-                instance.status = 'present'
-            elif start_time + timedelta(minutes=10) < current_time <= start_time + timedelta(minutes=60):
-                instance.status = 'late'
-            elif current_time > start_time + timedelta(minutes=60):
-                instance.status = 'absent'
-            else:
-                instance.status = 'tbd'
+            instance.status = classify(instance.schedule.start_time)
         else:
             # Otherwise, just update the status from validated_data
             instance.status = status_value
@@ -83,3 +86,97 @@ class AttendanceCountSerializer(serializers.Serializer):
     absent_count = serializers.IntegerField(default=0, help_text="Number of 'absent' records.")
     exception_count = serializers.IntegerField(default=0, help_text="Number of 'exception' records.")
     tbd_count = serializers.IntegerField(default=0, help_text="Number of 'tbd' (to be determined) records.")
+
+
+# ── Offline scanner ──
+
+class ScannerRosterEntrySerializer(serializers.Serializer):
+    attendance_id = serializers.UUIDField()
+    user_id = serializers.IntegerField()
+    name = serializers.CharField()
+    team = serializers.CharField()
+    status = serializers.CharField()
+    method = serializers.CharField(allow_null=True)
+
+
+class ScannerQRCodeSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    user_id = serializers.IntegerField()
+    expires_at = serializers.DateTimeField()
+
+
+class ScannerSnapshotSerializer(serializers.Serializer):
+    """Roster snapshot an offline scanner downloads before a session."""
+    schedule = ScheduleSummarySerializer()
+    version = serializers.CharField(help_text="로스터 버전 (변경 시 값이 바뀝니다)")
+    generated_at = serializers.DateTimeField()
+    roster = ScannerRosterEntrySerializer(many=True)
+    qr_codes = ScannerQRCodeSerializer(many=True, help_text="아직 사용되지 않은 QR 코드 (토큰 모드의 QR 코드는 업로드 시 검증)")
+
+
+class ScannerScanSerializer(serializers.Serializer):
+    qr_code_value = serializers.CharField(max_length=512)
+    scanned_at = serializers.DateTimeField(help_text="스캐너에서 QR 코드를 읽은 시각")
+
+
+class ScannerCheckInSerializer(serializers.Serializer):
+    """Batch of scans an offline scanner uploads once it is back online."""
+    schedule_id = serializers.UUIDField()
+    scans = ScannerScanSerializer(many=True, allow_empty=False)
+
+    def validate_scans(self, value):
+        if len(value) > MAX_BATCH_SIZE:
+            raise serializers.ValidationError(f"한 번에 최대 {MAX_BATCH_SIZE}개의 스캔만 업로드할 수 있습니다.")
+        return value
+
+
+class ScannerCheckInResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField(help_text="요청한 scans 배열의 위치")
+    result = serializers.CharField(help_text="recorded, already_recorded, duplicate, invalid, not_found, expired, used, not_on_roster")
+    user_id = serializers.IntegerField(allow_null=True)
+    attendance_id = serializers.UUIDField(allow_null=True)
+    status = serializers.CharField(allow_null=True)
+
+
+class ScannerCheckInSummarySerializer(serializers.Serializer):
+    results = ScannerCheckInResultSerializer(many=True)
+    summary = serializers.DictField(child=serializers.IntegerField(), help_text="result 별 개수")
+    version = serializers.CharField(help_text="반영 후 로스터 버전")
+
+
+# ── Bulk update ──
+
+class AttendanceBulkUpdateSerializer(serializers.Serializer):
+    """
+    Targets: either `ids`, or `schedule_id` (optionally with `team`).
+    Changes: at least one of `status`, `method`, `note`.
+    """
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, allow_empty=False, max_length=MAX_BULK_IDS,
+        help_text=f"수정할 출석 ID 목록 (최대 {MAX_BULK_IDS}개)",
+    )
+    schedule_id = serializers.UUIDField(required=False, help_text="ids 대신 스케줄의 출석 전체를 대상으로 지정")
+    team = serializers.CharField(required=False, allow_blank=False, help_text="schedule_id와 함께 사용: 해당 팀만 대상으로 지정")
+    status = serializers.ChoiceField(choices=Attendance.ATTENDANCE_STATUS_CHOICES, required=False)
+    method = serializers.ChoiceField(choices=Attendance.METHOD_CHOICES, required=False, allow_null=True)
+    note = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('schedule_id' in attrs):
+            raise serializers.ValidationError("ids 또는 schedule_id 중 하나만 지정해야 합니다.")
+        if 'team' in attrs and 'schedule_id' not in attrs:
+            raise serializers.ValidationError({"team": "team은 schedule_id와 함께 사용해야 합니다."})
+        if not any(field in attrs for field in ('status', 'method', 'note')):
+            raise serializers.ValidationError("status, method, note 중 하나 이상을 지정해야 합니다.")
+        return attrs
+
+
+class AttendanceBulkUpdateResultSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    outcome = serializers.CharField(help_text="updated, unchanged, not_found")
+    status = serializers.CharField(allow_null=True)
+
+
+class AttendanceBulkUpdateSummarySerializer(serializers.Serializer):
+    results = AttendanceBulkUpdateResultSerializer(many=True)
+    summary = serializers.DictField(child=serializers.IntegerField(), help_text="outcome 별 개수")
@@ -1,7 +1,8 @@
-from django.db.models.signals import m2m_changed, post_save
+from django.db.models.signals import m2m_changed, post_save, pre_delete, post_delete
 from django.dispatch import receiver
 from schedules.models import Schedule
-from attendances.models import Attendance
+from attendances.counters import refresh_counters
+from attendances.roster import schedule_user_sync, sync_schedule_roster
 from django.contrib.auth.models import User
 
 import pprint
@@ -9,100 +10,110 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-def user_is_staff_or_moderator(user):
-    """Helper to check if a user is staff or a moderator."""
-    return user.is_staff or user.groups.filter(name="moderator").exists()
+_UNKNOWN = object()
 
 @receiver(m2m_changed, sender=User.groups.through)
-def sync_attendance_on_user_groups_change(sender, instance, action, pk_set, **kwargs):
+def sync_attendance_on_user_groups_change(sender, instance, action, reverse, pk_set, **kwargs):
     """
-    Sync attendance records when a user's group membership changes.
+    Sync attendance records when group memberships change, from either side
+    (user.groups.add(...) or group.user_set.add(...)).
+
+    The affected users are queued and reconciled once when the transaction
+    commits (see attendances.roster.schedule_user_sync).
 
     Args:
         sender: The model class sending the signal.
-        instance: The User instance whose groups changed.
+        instance: The User (reverse=False) or Group (reverse=True) whose memberships changed.
         action: The type of change ('post_add', 'post_remove', etc.).
-        pk_set: Set of Group primary keys added/removed.
+        reverse: True when the change was made from the Group side.
+        pk_set: Primary keys of the Groups (reverse=False) or Users (reverse=True) added/removed.
         kwargs: Additional keyword arguments.
     """
-    logger.debug(
-        "m2m_changed signal received\n"
-        f"Action: {action}\n"
-        f"User: {instance}\n"
-        f"Groups changed: {pk_set}\n"
-        f"kwargs: {pprint.pformat(kwargs)}"
-    )
-
-    user = instance
-
-    if action == 'post_add':
-        # Find all schedules for the newly added groups
-        schedules = Schedule.objects.filter(group__in=pk_set).distinct()
-        attendance_to_create = []
-
-        for schedule in schedules:
-            if not user_is_staff_or_moderator(user):
-                attendance_to_create.append(
-                    Attendance(user=user, schedule=schedule, status='tbd')
-                )
-
-        if attendance_to_create:
-            Attendance.objects.bulk_create(attendance_to_create, ignore_conflicts=True)
-            logger.info(f"Created {len(attendance_to_create)} attendance records for user {user}.")
-
-    elif action == 'post_remove':
-        # Remove attendance records for schedules in the removed groups
-        deleted_count, _ = Attendance.objects.filter(
-            user=user, schedule__group__in=pk_set
-        ).delete()
-        logger.info(f"Deleted {deleted_count} attendance records for user {user}.")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "m2m_changed signal received\n"
+            f"Action: {action}\n"
+            f"Instance: {instance!r} (reverse={reverse})\n"
+            f"Changed: {pk_set}\n"
+            f"kwargs: {pprint.pformat(kwargs)}"
+        )
+
+    if action == 'pre_clear':
+        # clear(): remember the memberships before the rows are gone
+        if reverse:
+            instance._roster_user_ids = list(instance.user_set.values_list('pk', flat=True))
+        else:
+            instance._roster_group_ids = list(instance.groups.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        user_ids = [instance.pk]
+        group_ids = getattr(instance, '_roster_group_ids', []) if action == 'post_clear' else pk_set or []
+    else:
+        user_ids = getattr(instance, '_roster_user_ids', []) if action == 'post_clear' else pk_set or []
+        group_ids = [instance.pk]
+    if user_ids:
+        # Additions only create records; removals delete those of the left groups' schedules
+        schedule_user_sync(user_ids, removed_group_ids=group_ids if action != 'post_add' else ())
 
 @receiver(post_save, sender=Schedule)
-def sync_attendance_on_schedule_group_change(sender, instance, created, **kwargs):
+def sync_attendance_on_schedule_group_change(sender, instance, created, update_fields=None, **kwargs):
     """
-    Sync attendance records when a Schedule's group changes or is created.
+    Sync attendance records when a Schedule is created or its group changes.
+    Other edits (title, description, times) leave the roster alone; a new
+    start_time is copied onto the schedule's attendances.
 
     Args:
         sender: The model class sending the signal.
         instance: The Schedule instance that was saved.
         created: Boolean, True if a new record was created.
+        update_fields: The fields passed to save(update_fields=...), if any.
         kwargs: Additional keyword arguments.
     """
-    logger.debug(
-        "post_save signal received\n"
-        f"Schedule: {instance}\n"
-        f"created: {created}\n"
-        f"kwargs: {pprint.pformat(kwargs)}"
-    )
     schedule = instance
-
-    # Users who currently have attendance for this schedule
-    users_with_attendance = User.objects.filter(
-        attendances__schedule=schedule
-    ).distinct()
-
-    # Users in the current group of the schedule
-    users_in_group = schedule.group.user_set.all() if schedule.group else User.objects.none()
-
-    # Remove attendance for users no longer in the group
-    users_to_remove = users_with_attendance.exclude(pk__in=users_in_group.values_list('pk', flat=True))
-    if users_to_remove.exists():
-        deleted_count, _ = Attendance.objects.filter(
-            schedule=schedule, user__in=users_to_remove
-        ).delete()
-        logger.info(f"Deleted {deleted_count} attendance records for schedule {schedule}.")
-
-    # Add attendance for new users in the group
-    if schedule.group:
-        users_to_add = users_in_group.exclude(pk__in=users_with_attendance.values_list('pk', flat=True))
-        attendance_to_create = []
-
-        for user in users_to_add:
-            if not user_is_staff_or_moderator(user):
-                attendance_to_create.append(
-                    Attendance(user=user, schedule=schedule, status='tbd')
-                )
-
-        if attendance_to_create:
-            Attendance.objects.bulk_create(attendance_to_create, ignore_conflicts=True)
-            logger.info(f"Created {len(attendance_to_create)} attendance records for schedule {schedule}.")
+    loaded_values = getattr(schedule, '_loaded_values', {})
+
+    group_saved = update_fields is None or not {'group', 'group_id'}.isdisjoint(update_fields)
+    # A deferred or never loaded group counts as changed
+    group_changed = group_saved and loaded_values.get('group_id', _UNKNOWN) != schedule.group_id
+    if created or group_changed:
+        added_user_ids, removed_user_ids = sync_schedule_roster(schedule)
+        logger.info(
+            f"Synced attendance for schedule {schedule}: "
+            f"created {len(added_user_ids)}, deleted {len(removed_user_ids)}."
+        )
+
+    # Attendance.schedule_start_time mirrors the schedule (a deferred or never loaded start_time counts as changed)
+    start_time_saved = update_fields is None or 'start_time' in update_fields
+    if not created and start_time_saved and loaded_values.get('start_time', _UNKNOWN) != schedule.start_time:
+        schedule.attendances.update(schedule_start_time=schedule.start_time)
+
+    # Per-user counters are keyed by the schedule's cohort
+    if 'cohort_id' in loaded_values and loaded_values['cohort_id'] != schedule.cohort_id:
+        refresh_counters(user_ids=schedule.attendances.values_list('user_id', flat=True))
+    schedule._loaded_values = {**loaded_values, 'cohort_id': schedule.cohort_id}
+    if group_saved:
+        schedule._loaded_values['group_id'] = schedule.group_id
+    if start_time_saved:
+        schedule._loaded_values['start_time'] = schedule.start_time
+
+
+@receiver(pre_delete, sender=Schedule)
+@receiver(pre_delete, sender=User)
+def collect_counter_keys_before_delete(sender, instance, **kwargs):
+    """Remember whose counters change when attendances are removed by cascade."""
+    if sender is Schedule:
+        instance._counter_user_ids = list(instance.attendances.values_list('user_id', flat=True))
+    else:
+        instance._counter_schedule_ids = list(instance.attendances.values_list('schedule_id', flat=True))
+
+
+@receiver(post_delete, sender=Schedule)
+@receiver(post_delete, sender=User)
+def refresh_counters_after_delete(sender, instance, **kwargs):
+    refresh_counters(
+        schedule_ids=getattr(instance, '_counter_schedule_ids', []),
+        user_ids=getattr(instance, '_counter_user_ids', []),
+    )
@@ -0,0 +1,37 @@
+# attendances/status.py
+"""
+Classification of an attendance by check-in time, relative to the
+schedule's start:
+
+    before start - 1h               tbd      (check-in not open yet)
+    start - 1h  .. start + 10m      present
+    start + 10m .. start + 60m      late
+    after start + 60m               absent
+
+Once the late window has closed, remaining 'tbd' rows are finalized to
+'absent' (see attendances.finalizer).
+"""
+from datetime import timedelta
+
+from django.utils.timezone import now
+
+CHECK_IN_OPENS = timedelta(hours=1)
+PRESENT_UNTIL = timedelta(minutes=10)
+LATE_UNTIL = timedelta(minutes=60)
+
+
+def classify(start_time, at=None):
+    """Status of a check-in at `at` (default now) for a schedule starting at start_time."""
+    at = at or now()
+    if start_time - CHECK_IN_OPENS <= at <= start_time + PRESENT_UNTIL:
+        return 'present'
+    if start_time + PRESENT_UNTIL < at <= start_time + LATE_UNTIL:
+        return 'late'
+    if at > start_time + LATE_UNTIL:
+        return 'absent'
+    return 'tbd'
+
+
+def late_window_closed(at=None):
+    """Latest start_time whose late window has closed by `at`: schedules with start_time < this are over."""
+    return (at or now()) - LATE_UNTIL
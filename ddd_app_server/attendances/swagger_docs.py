@@ -1,5 +1,10 @@
 from rest_framework import serializers
-from .serializers import AttendanceSerializer
+from .serializers import (
+    AttendanceSerializer,
+    AttendanceBulkUpdateSummarySerializer,
+    ScannerSnapshotSerializer,
+    ScannerCheckInSummarySerializer,
+)
 
 # ── Attendance 관련 Response Wrapper ──
 
@@ -8,6 +13,8 @@ class AttendanceListResponseSerializer(serializers.Serializer):
     code = serializers.IntegerField(default=200)
     message = serializers.CharField(default="출석 목록을 성공적으로 조회했습니다.")
     data = AttendanceSerializer(many=True)
+    next = serializers.CharField(allow_null=True, help_text="다음 페이지 커서")
+    prev = serializers.CharField(allow_null=True, help_text="이전 페이지 커서")
 
 # 출석 상세 조회 응답
 class AttendanceDetailResponseSerializer(serializers.Serializer):
@@ -20,3 +27,21 @@ class AttendanceUpdateResponseSerializer(serializers.Serializer):
     code = serializers.IntegerField(default=200)
     message = serializers.CharField(default="출석이 성공적으로 업데이트되었습니다.")
     data = AttendanceSerializer()
+
+# 출석 일괄 수정 응답
+class AttendanceBulkUpdateResponseSerializer(serializers.Serializer):
+    code = serializers.IntegerField(default=200)
+    message = serializers.CharField(default="출석 정보를 일괄 수정했습니다.")
+    data = AttendanceBulkUpdateSummarySerializer()
+
+# 오프라인 스캐너 로스터 스냅샷 응답
+class ScannerSnapshotResponseSerializer(serializers.Serializer):
+    code = serializers.IntegerField(default=200)
+    message = serializers.CharField(default="스캐너 로스터를 성공적으로 조회했습니다.")
+    data = ScannerSnapshotSerializer()
+
+# 오프라인 스캐너 체크인 업로드 응답
+class ScannerCheckInResponseSerializer(serializers.Serializer):
+    code = serializers.IntegerField(default=200)
+    message = serializers.CharField(default="스캔 기록을 반영했습니다.")
+    data = ScannerCheckInSummarySerializer()
@@ -1,15 +1,23 @@
 from django.urls import path
 from .views import (
     AttendanceListView,
+    AttendanceExportView,
     AttendanceDetailView,
+    AttendanceBulkUpdateView,
     AttendanceCountView,
     AttendWithQRView,
+    ScannerSnapshotView,
+    ScannerCheckInView,
 )
 
 urlpatterns = [
     # Attendance endpoints
     path('', AttendanceListView.as_view(), name='attendance-list'),
     path('count/', AttendanceCountView.as_view(), name='attendance-count'),
+    path('export/', AttendanceExportView.as_view(), name='attendance-export'),
+    path('bulk-update/', AttendanceBulkUpdateView.as_view(), name='attendance-bulk-update'),
     path('attend-with-qr/', AttendWithQRView.as_view(), name='attendance-qr'),
+    path('scanner/snapshot/', ScannerSnapshotView.as_view(), name='attendance-scanner-snapshot'),
+    path('scanner/checkins/', ScannerCheckInView.as_view(), name='attendance-scanner-checkins'),
     path('<uuid:attendance_id>/', AttendanceDetailView.as_view(), name='attendance-detail'),
 ]
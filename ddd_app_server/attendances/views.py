@@ -1,11 +1,18 @@
-from datetime import datetime, timedelta
+import csv
+import json
+from collections import namedtuple
+from datetime import datetime
 
 # Python Standard Libraries & Django Imports
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.utils.timezone import now
+from django.utils.timezone import now, localtime
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.db.models import Count, Q, Case, When, IntegerField
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Max, Q, Case, When, IntegerField
 
 # Third-party Library Imports
 from drf_yasg.utils import swagger_auto_schema
@@ -16,26 +23,91 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 # Local Application/Library Specific Imports
-from common.mixins import BaseResponseMixin
-from common.serializers import ErrorResponseSerializer
+from common.filters import DateRangeFilter, InvalidDateParam
+from common.mixins import BaseResponseMixin, ConditionalGetMixin
+from common.roles import is_staff_or_moderator
+from common.pagination import KeysetCursorPagination, InvalidCursor
+from common.serializers import CompiledRowMapper, ErrorResponseSerializer, SPARSE_FIELDSET_PARAMETERS
+from schedules.mixins import CurrentScheduleMixin
 from schedules.models import Schedule
+from schedules import timeline
 from qrcodes.models import QRLog
+from qrcodes import tokens as qr_tokens
 from .models import Attendance
-from .serializers import AttendanceSerializer, AttendanceCountSerializer
-from rest_framework.exceptions import PermissionDenied
+from . import bulk, counters, scanner
+from .status import CHECK_IN_OPENS, classify
+from .serializers import (
+    AttendanceSerializer,
+    AttendanceCountSerializer,
+    AttendanceBulkUpdateSerializer,
+    AttendanceBulkUpdateSummarySerializer,
+    ScannerSnapshotSerializer,
+    ScannerCheckInSerializer,
+    ScannerCheckInSummarySerializer,
+)
+from rest_framework.exceptions import NotFound, PermissionDenied
 from .swagger_docs import (
     AttendanceListResponseSerializer,
     # AttendanceCreateResponseSerializer,
     AttendanceDetailResponseSerializer,
     AttendanceUpdateResponseSerializer,
     # AttendanceDeleteResponseSerializer
+    AttendanceBulkUpdateResponseSerializer,
+    ScannerSnapshotResponseSerializer,
+    ScannerCheckInResponseSerializer,
 )
 
 # Get the User model
 User = get_user_model()
 
+# start_date/end_date 쿼리 파라미터 → 일정 시작/종료 시각의 [start, end) 범위
+SCHEDULE_DATE_RANGE = DateRangeFilter('schedule__start_time', 'schedule__end_time')
+
+# ── AttendanceFilterMixin: 출석 목록 공통 필터 (Query Param Filtering) ──
+class AttendanceFilterMixin:
+    def get_filtered_queryset(self, request, is_staff):
+        """
+        Returns the attendances visible to the requester with the
+        user_id, schedule_id, team, start_date and end_date query params applied.
+        Raises PermissionDenied, InvalidDateParam or ValueError for invalid filters.
+        """
+        user_id_filter = request.query_params.get('user_id')
+        schedule_id_filter = request.query_params.get('schedule_id')
+        team_filter = request.query_params.get('team')
+
+        # 기본 쿼리셋: 스태프는 전체, 일반 사용자는 자신 것만
+        if is_staff:
+            filtered_queryset = Attendance.objects.all()
+        else:
+            filtered_queryset = Attendance.objects.filter(user=request.user)
+
+        # Schedule ID 필터링 (모든 사용자 가능)
+        if schedule_id_filter:
+            filtered_queryset = filtered_queryset.filter(schedule__id=schedule_id_filter)
+
+        # User ID 필터링
+        if user_id_filter:
+            user_id_to_filter = int(user_id_filter)
+            if is_staff:
+                # 스태프는 모든 사용자로 필터링 가능
+                filtered_queryset = filtered_queryset.filter(user__id=user_id_to_filter)
+            else:
+                # 일반 사용자는 오직 자신의 ID로만 필터링 가능 (사실상 기본 쿼리셋에서 이미 처리됨)
+                if user_id_to_filter != request.user.id:
+                    raise PermissionDenied("다른 사용자의 출석 목록을 조회할 권한이 없습니다.")
+
+        # Team 필터링
+        if team_filter:
+            filtered_queryset = filtered_queryset.filter(user__member_attribute__team=team_filter)
+
+        # 날짜 필터링 (start_date ≤ 일정 시작, 일정 종료 ≤ end_date)
+        filtered_queryset = SCHEDULE_DATE_RANGE.filter_queryset(filtered_queryset, request.query_params)
+
+        return filtered_queryset
+
+
 # ── AttendanceListView: 출석 목록 조회 (Query Param Filtering) ──
-class AttendanceListView(BaseResponseMixin, APIView):
+class AttendanceListView(AttendanceFilterMixin, ConditionalGetMixin, BaseResponseMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
     authentication_classes = [JWTAuthentication]
     serializer_class = AttendanceSerializer
@@ -47,6 +119,8 @@ class AttendanceListView(BaseResponseMixin, APIView):
         출석 목록을 조회합니다. 
         쿼리 파라미터 'user_id' 또는 'schedule_id'를 사용하여 필터링할 수 있습니다.
         스태프 사용자는 모든 출석 기록을 대상으로 필터링하며, 일반 사용자는 자신의 출석 기록 내에서 필터링합니다.
+        결과는 (스케줄 시작 시간, ID) 순으로 정렬되며, 응답의 'next'/'prev' 커서를 'cursor' 파라미터로 전달하여 다음/이전 페이지를 조회합니다.
+        응답의 ETag를 If-None-Match 헤더로 전달하면, 변경 사항이 없을 때 304 Not Modified를 반환합니다.
         """,
         manual_parameters=[
             openapi.Parameter('user_id', openapi.IN_QUERY, description="필터링할 사용자의 ID", type=openapi.TYPE_INTEGER),
@@ -54,67 +128,172 @@ class AttendanceListView(BaseResponseMixin, APIView):
             openapi.Parameter('team', openapi.IN_QUERY, description="팀 이름", type=openapi.TYPE_STRING),
             openapi.Parameter('start_date', openapi.IN_QUERY, description="시작 날짜 (YYYY-MM-DD)", type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
             openapi.Parameter('end_date', openapi.IN_QUERY, description="종료 날짜 (YYYY-MM-DD)", type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
+            openapi.Parameter('cursor', openapi.IN_QUERY, description="이전 응답의 next/prev 커서", type=openapi.TYPE_STRING),
+            openapi.Parameter('limit', openapi.IN_QUERY, description=f"페이지 크기 (기본 {KeysetCursorPagination.default_limit}, 최대 {KeysetCursorPagination.max_limit})", type=openapi.TYPE_INTEGER),
+            *SPARSE_FIELDSET_PARAMETERS,
         ],
         responses={
             200: AttendanceListResponseSerializer(),
+            304: "변경 사항 없음 (Not Modified)",
             400: ErrorResponseSerializer()
         }
     )
     def get(self, request, *args, **kwargs):
-        user_id_filter = request.query_params.get('user_id')
-        schedule_id_filter = request.query_params.get('schedule_id')
-        team_filter = request.query_params.get('team')
-        start_date_filter = request.query_params.get('start_date')
-        end_date_filter = request.query_params.get('end_date')
-
-
         # 기본 쿼리셋: 스태프는 전체, 일반 사용자는 자신 것만
-        is_staff = (request.user.is_staff or request.user.groups.filter(name="moderator").exists())
-        if is_staff:
-            base_queryset = Attendance.objects.select_related('user', 'schedule').all() # Optimization
-        else:
-            base_queryset = Attendance.objects.select_related('user', 'schedule').filter(user=request.user)
+        is_staff = is_staff_or_moderator(request.user)
+        try:
+            filtered_queryset = self.get_filtered_queryset(request, is_staff)
+            version = self.get_version(filtered_queryset)
+        except PermissionDenied as e:
+            return self.create_response(403, str(e.detail), None, status.HTTP_403_FORBIDDEN)
+        except InvalidDateParam as e:
+            return self.create_response(400, e.message, e.detail, status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return self.create_response(400, "잘못된 user_id 또는 schedule_id 형식입니다.", None, status.HTTP_400_BAD_REQUEST)
 
-        filtered_queryset = base_queryset
+        # 변경 사항이 없으면 직렬화 없이 304 반환
+        etag = self.get_etag(request, is_staff, *version)
+        not_modified = self.get_not_modified_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        # 읽기 전용 목록은 컴파일된 row mapper로 직렬화 (AttendanceSerializer와 동일한 출력, 단일 values() 쿼리)
+        mapper = CompiledRowMapper.for_serializer(self.serializer_class(context={"request": request}))
+        # (schedule_start_time, id) 인덱스로 seek (schedule.start_time의 비정규화 복사본)
+        paginator = KeysetCursorPagination(ordering=('schedule_start_time', 'id'))
         try:
-            # Schedule ID 필터링 (모든 사용자 가능)
-            if schedule_id_filter:
-                filtered_queryset = filtered_queryset.filter(schedule__id=schedule_id_filter)
+            rows = paginator.paginate_queryset(
+                filtered_queryset.values(*mapper.lookups, *paginator.ordering), request
+            )
+        except InvalidCursor:
+            return self.create_response(400, "잘못된 cursor 값입니다.", None, status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return self.create_response(400, "잘못된 limit 값입니다.", None, status.HTTP_400_BAD_REQUEST)
+
+        data = mapper.to_representation(rows)
+        response = self.create_paginated_response(200, "출석 목록을 성공적으로 조회했습니다.", data, paginator)
+        return self.set_validators(response, etag=etag)
+
+    def get_version(self, queryset):
+        """
+        Cheap version of the filtered list: row count plus the latest change of
+        every model rendered in the response. Only an ETag is derived from it,
+        as a Last-Modified date cannot reflect removed rows.
+        """
+        version = queryset.order_by().aggregate(
+            count=Count('id'),
+            attendance=Max('updated_at'),
+            schedule=Max('schedule__updated_at'),
+            profile=Max('user__profile__updated_at'),
+            member_attribute=Max('user__member_attribute__updated_at'),
+        )
+        return tuple(version.values())
+
+
+# ── AttendanceExportView: 출석 기록 내보내기 (CSV / NDJSON 스트리밍) ──
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer streaming."""
+    def write(self, value):
+        return value
 
-            # User ID 필터링
-            if user_id_filter:
-                user_id_to_filter = int(user_id_filter)
-                if is_staff:
-                    # 스태프는 모든 사용자로 필터링 가능
-                    filtered_queryset = filtered_queryset.filter(user__id=user_id_to_filter)
-                else:
-                    # 일반 사용자는 오직 자신의 ID로만 필터링 가능 (사실상 base_queryset 에서 이미 처리됨)
-                    if user_id_to_filter != request.user.id:
-                         return self.create_response(403, "다른 사용자의 출석 목록을 조회할 권한이 없습니다.", None, status.HTTP_403_FORBIDDEN)
-
-            # Team 필터링
-            if team_filter:
-                filtered_queryset = filtered_queryset.filter(user__groups__name=f"team:{team_filter}")
-            
-            # 날짜 필터링
-            if start_date_filter:
-                start_date = datetime.strptime(start_date_filter, '%Y-%m-%d').date()
-                filtered_queryset = filtered_queryset.filter(schedule__start_time__date__gte=start_date)
-            if end_date_filter:
-                end_date = datetime.strptime(end_date_filter, '%Y-%m-%d').date()
-                filtered_queryset = filtered_queryset.filter(schedule__end_time__date__lte=end_date)
 
+class AttendanceExportView(AttendanceFilterMixin, BaseResponseMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    EXPORT_FORMATS = ('csv', 'ndjson')
+    CHUNK_SIZE = 2000
+    COLUMNS = (
+        ('id', 'id'),
+        ('user_id', 'user_id'),
+        ('name', 'user__profile__name'),
+        ('team', 'user__member_attribute__team'),
+        ('schedule_id', 'schedule_id'),
+        ('schedule_title', 'schedule__title'),
+        ('start_time', 'schedule__start_time'),
+        ('end_time', 'schedule__end_time'),
+        ('status', 'status'),
+        ('method', 'method'),
+        ('note', 'note'),
+        ('updated_at', 'updated_at'),
+    )
+
+    @swagger_auto_schema(
+        tags=["attendance"],
+        operation_summary="출석 기록 내보내기",
+        operation_description="""
+        출석 기록을 CSV 또는 NDJSON 형식으로 스트리밍하여 내보냅니다.
+        출석 목록 조회와 동일한 필터(user_id, schedule_id, team, start_date, end_date)를 사용할 수 있습니다.
+        """,
+        manual_parameters=[
+            openapi.Parameter('export_format', openapi.IN_QUERY, description="내보내기 형식 (csv, ndjson / 기본 csv)", type=openapi.TYPE_STRING, enum=list(EXPORT_FORMATS)),
+            openapi.Parameter('user_id', openapi.IN_QUERY, description="필터링할 사용자의 ID", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('schedule_id', openapi.IN_QUERY, description="필터링할 스케줄의 ID", type=openapi.TYPE_STRING),
+            openapi.Parameter('team', openapi.IN_QUERY, description="팀 이름", type=openapi.TYPE_STRING),
+            openapi.Parameter('start_date', openapi.IN_QUERY, description="시작 날짜 (YYYY-MM-DD)", type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
+            openapi.Parameter('end_date', openapi.IN_QUERY, description="종료 날짜 (YYYY-MM-DD)", type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
+        ],
+        responses={
+            200: openapi.Response(description="CSV 또는 NDJSON 스트림"),
+            400: ErrorResponseSerializer(),
+            403: ErrorResponseSerializer(),
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in self.EXPORT_FORMATS:
+            return self.create_response(400, "지원하지 않는 내보내기 형식입니다.", None, status.HTTP_400_BAD_REQUEST)
+
+        is_staff = is_staff_or_moderator(request.user)
+        try:
+            filtered_queryset = self.get_filtered_queryset(request, is_staff)
+        except PermissionDenied as e:
+            return self.create_response(403, str(e.detail), None, status.HTTP_403_FORBIDDEN)
+        except InvalidDateParam as e:
+            return self.create_response(400, e.message, e.detail, status.HTTP_400_BAD_REQUEST)
         except ValueError:
             return self.create_response(400, "잘못된 user_id 또는 schedule_id 형식입니다.", None, status.HTTP_400_BAD_REQUEST)
-        except Schedule.DoesNotExist: # 만약 schedule_id 로 필터링 시 존재하지 않는 경우
-             return self.create_response(404, "해당 스케줄을 찾을 수 없습니다.", None, status.HTTP_404_NOT_FOUND)
-        except User.DoesNotExist: # 만약 user_id 로 필터링 시 존재하지 않는 경우
-             return self.create_response(404, "해당 사용자를 찾을 수 없습니다.", None, status.HTTP_404_NOT_FOUND)
 
+        rows = (
+            filtered_queryset
+            .order_by('schedule_start_time', 'id')
+            .values_list(*(lookup for _, lookup in self.COLUMNS))
+            .iterator(chunk_size=self.CHUNK_SIZE)
+        )
 
-        attendances = filtered_queryset.distinct()
-        serializer = self.serializer_class(attendances, many=True, context={"request": request})
-        return self.create_response(200, "출석 목록을 성공적으로 조회했습니다.", serializer.data)
+        if export_format == 'csv':
+            stream = self._stream_csv(rows)
+            content_type = 'text/csv; charset=utf-8'
+        else:
+            stream = self._stream_ndjson(rows)
+            content_type = 'application/x-ndjson; charset=utf-8'
+
+        filename = f"attendances-{localtime(now()):%Y%m%d%H%M%S}.{export_format}"
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def _format_row(self, row):
+        values = []
+        for (column, _), value in zip(self.COLUMNS, row):
+            if isinstance(value, datetime):
+                value = localtime(value).isoformat()
+            elif value is not None and not isinstance(value, (str, int)):
+                value = str(value)
+            values.append(value)
+        return values
+
+    def _stream_csv(self, rows):
+        writer = csv.writer(_Echo())
+        # 헤더는 쿼리 실행 전에 먼저 전송됩니다. (BOM: 엑셀에서 한글 깨짐 방지)
+        yield '\ufeff' + writer.writerow([column for column, _ in self.COLUMNS])
+        for row in rows:
+            yield writer.writerow(self._format_row(row))
+
+    def _stream_ndjson(self, rows):
+        columns = [column for column, _ in self.COLUMNS]
+        for row in rows:
+            yield json.dumps(dict(zip(columns, self._format_row(row))), ensure_ascii=False) + '\n'
 
 
 # ── AttendanceDetailView: 출석 상세 조회, 수정, 삭제 ──
@@ -139,7 +318,7 @@ class AttendanceDetailView(BaseResponseMixin, APIView):
 
             # Permission Check: Is the requester the owner or staff?
             is_owner = (attendance.user == request.user)
-            is_staff = (request.user.is_staff or request.user.groups.filter(name="moderator").exists())
+            is_staff = is_staff_or_moderator(request.user)
 
             if not (is_owner or is_staff):
                 raise PermissionDenied("이 출석 정보에 접근할 권한이 없습니다.")
@@ -161,6 +340,7 @@ class AttendanceDetailView(BaseResponseMixin, APIView):
         tags=["attendance"],
         operation_summary="출석 상세 조회 (ID 기준)",
         operation_description="특정 ID를 가진 출석 상세 정보를 조회합니다. 본인 또는 스태프만 조회 가능합니다.",
+        manual_parameters=SPARSE_FIELDSET_PARAMETERS,
         responses={
             200: AttendanceDetailResponseSerializer(),
             403: ErrorResponseSerializer(),
@@ -220,6 +400,51 @@ class AttendanceDetailView(BaseResponseMixin, APIView):
     #     return self.create_response(204, "출석이 성공적으로 삭제되었습니다.", None)
 
 
+# ── AttendanceBulkUpdateView: 출석 일괄 수정 (운영진) ──
+class AttendanceBulkUpdateView(BaseResponseMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    @swagger_auto_schema(
+        tags=["attendance"],
+        operation_summary="출석 일괄 수정",
+        operation_description=f"""
+        여러 출석 정보를 한 번에 수정합니다. 스태프 또는 운영진만 사용할 수 있습니다.
+        대상은 ids(최대 {bulk.MAX_BULK_IDS}개) 또는 schedule_id(+ team)로 지정하고, status / method / note 중 하나 이상을 변경합니다.
+        status가 'auto'이면 각 출석의 스케줄 시작 시간을 기준으로 상태를 판정합니다.
+        모든 변경은 하나의 트랜잭션으로 반영되며, 항목별 결과(updated / unchanged / not_found)를 반환합니다.
+        """,
+        request_body=AttendanceBulkUpdateSerializer,
+        responses={
+            200: AttendanceBulkUpdateResponseSerializer(),
+            400: ErrorResponseSerializer(),
+            403: ErrorResponseSerializer(),
+        }
+    )
+    def post(self, request, *args, **kwargs):
+        if not is_staff_or_moderator(request.user):
+            return self.create_response(403, "출석 정보를 일괄 수정할 권한이 없습니다.", None, status.HTTP_403_FORBIDDEN)
+
+        serializer = AttendanceBulkUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.create_response(400, "출석 일괄 수정에 실패했습니다.", serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        changes = {field: data[field] for field in bulk.CHANGE_FIELDS if field in data}
+        queryset = bulk.target_queryset(ids=data.get('ids'), schedule_id=data.get('schedule_id'), team=data.get('team'))
+        results = bulk.bulk_update_attendances(queryset, changes, requested_ids=data.get('ids'))
+
+        summary = dict.fromkeys(bulk.BULK_OUTCOMES, 0)
+        for item in results:
+            summary[item['outcome']] += 1
+        response_serializer = AttendanceBulkUpdateSummarySerializer({'results': results, 'summary': summary})
+        return self.create_response(200, "출석 정보를 일괄 수정했습니다.", response_serializer.data)
+
+
+# 스캔된 QR 코드: 출석 대상 사용자와 QR 코드 사용 처리 함수 (consume(at) -> 성공 여부)
+ScannedQRCode = namedtuple('ScannedQRCode', ['user_id', 'consume'])
+
+
 class AttendWithQRView(BaseResponseMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
     authentication_classes = [JWTAuthentication]
@@ -244,6 +469,7 @@ class AttendWithQRView(BaseResponseMixin, APIView):
             400: ErrorResponseSerializer(),
             403: ErrorResponseSerializer(),
             404: ErrorResponseSerializer(),
+            410: ErrorResponseSerializer(),
         }
     )
     def post(self, request, *args, **kwargs):
@@ -253,10 +479,86 @@ class AttendWithQRView(BaseResponseMixin, APIView):
         if not qr_code_value:
             return self.create_response(400, "QR 코드 값을 제공해야 합니다.", None, status.HTTP_400_BAD_REQUEST)
 
+        # QR 코드 확인: 서명된 토큰(토큰 모드) 또는 QRLog ID
+        qr_code, error_response = self.resolve_qr_code(qr_code_value)
+        if error_response is not None:
+            return error_response
+
+        # 출석 탐색
+        attendance: Attendance = None
+        if not schedule_id:
+            # 체크인 가능한 스케줄은 타임라인 인덱스에서 찾고, 그 중 시작이 가장 빠른 출석을 선택
+            schedule_ids = timeline.overlapping_schedule_ids(now(), lead=CHECK_IN_OPENS)
+            if schedule_ids:
+                candidates = {
+                    candidate.schedule_id: candidate
+                    for candidate in Attendance.objects.select_related('user', 'schedule').filter(
+                        user_id=qr_code.user_id,
+                        schedule_id__in=schedule_ids
+                    )
+                }
+                attendance = next((candidates[sid] for sid in schedule_ids if sid in candidates), None)
+        else:
+            attendance = Attendance.objects.select_related('user', 'schedule').filter(
+                user_id=qr_code.user_id,
+                schedule__id=schedule_id
+            ).first()
+        if not attendance:
+            return self.create_response(404, "해당 출석 기록을 찾을 수 없습니다.", None, status.HTTP_404_NOT_FOUND)
+
+        # TODO # Check if the user is allowed to mark attendance for this schedule
+        # if not (is_staff_or_moderator(request.user) or request.user == attendance.user):
+        #     return self.create_response(403, "이 스케줄에 대한 출석을 기록할 권한이 없습니다.", None, status.HTTP_403_FORBIDDEN)
+
+        # 출석 수정
+        if attendance:
+            current_time = now()
+            attendance.status = classify(attendance.schedule.start_time, current_time)
+            attendance.method = 'qr'
+
+            # QR 코드 사용 처리(조건부 UPDATE)와 출석 기록을 하나의 짧은 트랜잭션으로 처리
+            # 동시에 같은 QR 코드를 스캔한 경우 하나의 요청만 성공
+            with transaction.atomic():
+                if not qr_code.consume(current_time):
+                    return self.create_response(
+                        code=status.HTTP_410_GONE,
+                        message="이미 사용되었거나 만료된 QR 코드입니다.",
+                        data=None,
+                        status_code=status.HTTP_410_GONE
+                    )
+                attendance.save(update_fields=['status', 'method', 'updated_at'])
+
+        serializer = AttendanceSerializer(attendance, context={"request": request})
+        return self.create_response(200, "출석이 성공적으로 기록되었습니다.", serializer.data)
+
+    def resolve_qr_code(self, qr_code_value):
+        """
+        Returns (ScannedQRCode, None) for a usable QR code, or (None, error response).
+        Signed tokens are verified without a database read; QRLog ids are read and checked.
+        """
+        if qr_tokens.is_token(qr_code_value):
+            try:
+                token = qr_tokens.read_token(qr_code_value)
+            except signing.SignatureExpired:
+                return None, self.create_response(
+                    code=status.HTTP_410_GONE,
+                    message="만료된 QR 코드입니다.",
+                    data=None,
+                    status_code=status.HTTP_410_GONE
+                )
+            except signing.BadSignature:
+                return None, self.create_response(
+                    code=status.HTTP_404_NOT_FOUND,
+                    message="QR 코드 로그를 찾을 수 없습니다.",
+                    data=None,
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+            return ScannedQRCode(token.user_id, lambda at: qr_tokens.consume_nonce(token, at)), None
+
         try:
-            qr_log = QRLog.objects.select_related('user').get(pk=qr_code_value)
-        except QRLog.DoesNotExist:
-            return self.create_response(
+            qr_log = QRLog.objects.get(pk=qr_code_value)
+        except (QRLog.DoesNotExist, ValidationError):
+            return None, self.create_response(
                 code=status.HTTP_404_NOT_FOUND,
                 message="QR 코드 로그를 찾을 수 없습니다.",
                 data=None,
@@ -265,7 +567,7 @@ class AttendWithQRView(BaseResponseMixin, APIView):
 
         # 사례 1: QR 코드가 이미 사용됨
         if qr_log.decoded_at:
-            return self.create_response(
+            return None, self.create_response(
                 code=status.HTTP_410_GONE,
                 message="이미 사용된 QR 코드입니다.",
                 data=None,
@@ -274,59 +576,106 @@ class AttendWithQRView(BaseResponseMixin, APIView):
 
         # 사례 2: QR 코드가 만료됨
         if now() > qr_log.expires_at:
-            return self.create_response(
+            return None, self.create_response(
                 code=status.HTTP_410_GONE,
                 message="만료된 QR 코드입니다.",
                 data=None,
                 status_code=status.HTTP_410_GONE
             )
 
-        # 출석 탐색
-        attendance: Attendance = None
-        if not schedule_id:
-            attendance = Attendance.objects.select_related('user', 'schedule').filter(
-                user=qr_log.user,
-                schedule__start_time__lte=now() + timedelta(minutes=60),
-                schedule__end_time__gte=now()
-            ).first()
-        else:
-            attendance = Attendance.objects.select_related('user', 'schedule').filter(
-                user=qr_log.user,
-                schedule__id=schedule_id
-            ).first()
-        if not attendance:
-            return self.create_response(404, "해당 출석 기록을 찾을 수 없습니다.", None, status.HTTP_404_NOT_FOUND)
+        return ScannedQRCode(qr_log.user_id, lambda at: QRLog.objects.consume(qr_log.pk, at=at)), None
 
-        # TODO # Check if the user is allowed to mark attendance for this schedule
-        # if not (request.user.is_staff or request.user.groups.filter(name="moderator").exists() or request.user == attendance.user):
-        #     return self.create_response(403, "이 스케줄에 대한 출석을 기록할 권한이 없습니다.", None, status.HTTP_403_FORBIDDEN)
 
-        # 출석 수정
-        if attendance:
-            current_time = now()
-            schedule = attendance.schedule
-            start_time = schedule.start_time
-            # 출석: 시작 1시간 전 부터 시작 10분 후 까지
-            if start_time - timedelta(hours=1) <= current_time <= start_time + timedelta(minutes=10):
-                attendance.status = 'present'
-            # 지각: 시작 10분 이후부터 60분 이내
-            elif start_time + timedelta(minutes=10) < current_time <= start_time + timedelta(minutes=60):
-                attendance.status = 'late'
-            # 결석: 시작 60분 이후
-            elif current_time > start_time + timedelta(minutes=60):
-                attendance.status = 'absent'
-            else:
-                attendance.status = 'tbd'
-            attendance.method = 'qr'
-            attendance.save()
+# ── Offline scanner: 로스터 스냅샷 다운로드 / 스캔 일괄 업로드 ──
+class ScannerSnapshotView(CurrentScheduleMixin, ConditionalGetMixin, BaseResponseMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    @swagger_auto_schema(
+        tags=["attendance"],
+        operation_summary="오프라인 스캐너 로스터 스냅샷",
+        operation_description="""
+        네트워크가 끊겨도 QR 체크인을 받을 수 있도록, 스케줄의 출석 대상자 목록과 아직 사용되지 않은 QR 코드를 내려받습니다.
+        스태프 또는 운영진만 조회할 수 있습니다.
+        schedule_id를 생략하거나 'now'로 전달하면 현재 진행 중인 스케줄을 사용합니다.
+        응답의 ETag를 If-None-Match 헤더로 전달하면, 로스터가 변경되지 않았을 때 304 Not Modified를 반환합니다.
+        """,
+        manual_parameters=[
+            openapi.Parameter('schedule_id', openapi.IN_QUERY, description="스케줄 ID (UUID 또는 'now')", type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: ScannerSnapshotResponseSerializer(),
+            304: "변경 사항 없음 (Not Modified)",
+            400: ErrorResponseSerializer(),
+            403: ErrorResponseSerializer(),
+            404: ErrorResponseSerializer(),
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        if not is_staff_or_moderator(request.user):
+            return self.create_response(403, "스캐너 로스터를 조회할 권한이 없습니다.", None, status.HTTP_403_FORBIDDEN)
 
-        # 모든 확인을 통과하면 QR 코드가 유효함
-        # 'decoded_at' 타임스탬프를 설정하여 사용됨으로 표시
-        qr_log.decoded_at = now()
-        qr_log.save()
+        try:
+            schedule = self.get_schedule(request.query_params.get('schedule_id'))
+        except ValidationError:
+            return self.create_response(400, "잘못된 schedule_id 형식입니다.", None, status.HTTP_400_BAD_REQUEST)
+        except (NotFound, Http404):
+            return self.create_response(404, "스케줄을 찾을 수 없습니다.", None, status.HTTP_404_NOT_FOUND)
 
-        serializer = AttendanceSerializer(attendance, context={"request": request})
-        return self.create_response(200, "출석이 성공적으로 기록되었습니다.", serializer.data)
+        etag = self.get_etag(request, scanner.roster_version(schedule))
+        not_modified = self.get_not_modified_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = ScannerSnapshotSerializer(scanner.build_snapshot(schedule))
+        response = self.create_response(200, "스캐너 로스터를 성공적으로 조회했습니다.", serializer.data)
+        return self.set_validators(response, etag=etag)
+
+
+class ScannerCheckInView(BaseResponseMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    @swagger_auto_schema(
+        tags=["attendance"],
+        operation_summary="오프라인 스캐너 체크인 업로드",
+        operation_description=f"""
+        오프라인 스캐너가 모아 둔 QR 스캔 기록을 한 번에 업로드합니다. (최대 {scanner.MAX_BATCH_SIZE}개)
+        각 스캔은 scanned_at 시각 기준으로 출석/지각/결석이 판정되며, 하나의 트랜잭션으로 반영됩니다.
+        스캔마다 결과(result)를 반환하며, 같은 요청을 다시 업로드해도 이미 반영된 스캔은 already_recorded로 응답합니다.
+        스태프 또는 운영진만 업로드할 수 있습니다.
+        """,
+        request_body=ScannerCheckInSerializer,
+        responses={
+            200: ScannerCheckInResponseSerializer(),
+            400: ErrorResponseSerializer(),
+            403: ErrorResponseSerializer(),
+            404: ErrorResponseSerializer(),
+        }
+    )
+    def post(self, request, *args, **kwargs):
+        if not is_staff_or_moderator(request.user):
+            return self.create_response(403, "스캔 기록을 업로드할 권한이 없습니다.", None, status.HTTP_403_FORBIDDEN)
+
+        serializer = ScannerCheckInSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.create_response(400, "잘못된 스캔 기록입니다.", serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        schedule = Schedule.objects.filter(pk=serializer.validated_data['schedule_id']).first()
+        if schedule is None:
+            return self.create_response(404, "스케줄을 찾을 수 없습니다.", None, status.HTTP_404_NOT_FOUND)
+
+        results = scanner.apply_scans(schedule, serializer.validated_data['scans'])
+        summary = dict.fromkeys(scanner.SCAN_RESULTS, 0)
+        for item in results:
+            summary[item['result']] += 1
+
+        serializer = ScannerCheckInSummarySerializer({
+            'results': results,
+            'summary': summary,
+            'version': scanner.roster_version(schedule),
+        })
+        return self.create_response(200, "스캔 기록을 반영했습니다.", serializer.data)
 
 
 class AttendanceCountView(BaseResponseMixin, APIView):
@@ -367,7 +716,7 @@ class AttendanceCountView(BaseResponseMixin, APIView):
         end_date_str = request.query_params.get('end_date')
 
         # --- 2. Base Queryset based on Permissions ---
-        is_staff = (request.user.is_staff or request.user.groups.filter(name="moderator").exists())
+        is_staff = is_staff_or_moderator(request.user)
         if is_staff:
             base_queryset = Attendance.objects.all()
         else:
@@ -398,21 +747,13 @@ class AttendanceCountView(BaseResponseMixin, APIView):
                 filtered_queryset = filtered_queryset.filter(schedule__id=schedule_id_filter)
 
             # Date Range Filters (apply to the schedule's start_time and end_time fields)
-            if start_date_str:
-                start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                filtered_queryset = filtered_queryset.filter(schedule__start_time__date__gte=start_date)
-
-            if end_date_str:
-                end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-                filtered_queryset = filtered_queryset.filter(schedule__end_time__date__lte=end_date)
-
-        except ValueError as e:
-            # Handle invalid integer conversion or date format
-            error_msg = "Invalid filter value provided. Ensure IDs are integers and dates are YYYY-MM-DD."
-            # Be more specific based on the error if possible
-            if 'date' in str(e):
-                 error_msg = "Invalid date format. Please use YYYY-MM-DD."
-            return self.create_response(400, error_msg, None, status.HTTP_400_BAD_REQUEST)
+            filtered_queryset = SCHEDULE_DATE_RANGE.filter_queryset(filtered_queryset, request.query_params)
+
+        except InvalidDateParam as e:
+            return self.create_response(400, e.message, e.detail, status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            # Handle invalid integer conversion
+            return self.create_response(400, "Invalid filter value provided. Ensure IDs are integers.", None, status.HTTP_400_BAD_REQUEST)
         except Exception as e: # Catch other potential errors during filtering
             # Log the error e
             print(f"Error during filtering: {e}") # Replace with proper logging
@@ -420,14 +761,27 @@ class AttendanceCountView(BaseResponseMixin, APIView):
 
 
         # --- 4. Perform Aggregation ---
-        counts = filtered_queryset.aggregate(
-            attendance_count=Count('id'),
-            present_count=Count(Case(When(status='present', then=1), output_field=IntegerField())),
-            late_count=Count(Case(When(status='late', then=1), output_field=IntegerField())),
-            absent_count=Count(Case(When(status='absent', then=1), output_field=IntegerField())),
-            exception_count=Count(Case(When(status='exception', then=1), output_field=IntegerField())),
-            tbd_count=Count(Case(When(status='tbd', then=1), output_field=IntegerField())),
-        )
+        # Common filter shapes are answered from the maintained counter tables;
+        # group and date filters fall back to the live aggregate.
+        counts = None
+        if not (group_id_filter or start_date_str or end_date_str):
+            if schedule_id_filter:
+                if is_staff and not user_id_filter:
+                    counts = counters.counts_for_schedule(schedule_id_filter)
+            elif user_id_filter or not is_staff:
+                counts = counters.counts_for_user(int(user_id_filter) if user_id_filter else request.user.id)
+            else:
+                counts = counters.counts_total()
+
+        if counts is None:
+            counts = filtered_queryset.aggregate(
+                attendance_count=Count('id'),
+                present_count=Count(Case(When(status='present', then=1), output_field=IntegerField())),
+                late_count=Count(Case(When(status='late', then=1), output_field=IntegerField())),
+                absent_count=Count(Case(When(status='absent', then=1), output_field=IntegerField())),
+                exception_count=Count(Case(When(status='exception', then=1), output_field=IntegerField())),
+                tbd_count=Count(Case(When(status='tbd', then=1), output_field=IntegerField())),
+            )
 
         # --- 5. Serialize and Return ---
         serializer = AttendanceCountSerializer(data=counts)
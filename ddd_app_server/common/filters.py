@@ -0,0 +1,69 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+DATE_FORMAT = '%Y-%m-%d'
+
+
+class InvalidDateParam(ValidationError):
+    """Raised for a malformed date query parameter; the detail is keyed by the parameter name."""
+
+    def __init__(self, param):
+        self.param = param
+        self.message = f"{param}은(는) YYYY-MM-DD 형식의 날짜여야 합니다."
+        super().__init__({param: [self.message]})
+
+
+def parse_date(value, param):
+    """Parses a YYYY-MM-DD query param; raises InvalidDateParam naming the param."""
+    try:
+        return datetime.strptime(value, DATE_FORMAT).date()
+    except (TypeError, ValueError):
+        raise InvalidDateParam(param)
+
+
+def day_start(day):
+    """Midnight of the given day in the current time zone, as an aware datetime."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class DateRangeFilter:
+    """
+    Applies start_date / end_date (YYYY-MM-DD) query params as a half-open,
+    timezone-aware [start, end) range on raw datetime columns.
+
+    `field__date__gte=day` makes the database convert every row to the local
+    time zone before comparing, so no index can serve it. Comparing the raw
+    column against local midnight of start_date and of the day after end_date
+    selects the same rows and turns the filter into an index range scan.
+
+    start_field receives the lower bound and end_field (default: start_field)
+    the upper bound, so the range can span two columns (e.g. a schedule's
+    start_time and end_time).
+    """
+
+    def __init__(self, start_field, end_field=None, start_param='start_date', end_param='end_date'):
+        self.start_field = start_field
+        self.end_field = end_field or start_field
+        self.start_param = start_param
+        self.end_param = end_param
+
+    def get_bounds(self, query_params):
+        """
+        Returns the (start, end) aware datetimes for the query params; either is
+        None when its param is absent. Raises InvalidDateParam for malformed dates.
+        """
+        start_value = query_params.get(self.start_param)
+        end_value = query_params.get(self.end_param)
+        start = day_start(parse_date(start_value, self.start_param)) if start_value else None
+        end = day_start(parse_date(end_value, self.end_param) + timedelta(days=1)) if end_value else None
+        return start, end
+
+    def filter_queryset(self, queryset, query_params):
+        start, end = self.get_bounds(query_params)
+        if start is not None:
+            queryset = queryset.filter(**{f'{self.start_field}__gte': start})
+        if end is not None:
+            queryset = queryset.filter(**{f'{self.end_field}__lt': end})
+        return queryset
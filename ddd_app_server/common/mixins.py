@@ -1,3 +1,7 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
 from rest_framework.response import Response
 from rest_framework import status
 
@@ -20,4 +24,64 @@ class BaseResponseMixin:
             "message": message,
             "data": data
         }
-        return Response(response_data, status=status_code) 
+        return Response(response_data, status=status_code)
+
+    def create_paginated_response(self, code, message, data, paginator, status_code=status.HTTP_200_OK):
+        """
+        Create a standardized API response for a cursor-paginated list.
+
+        Adds the paginator's `next`/`prev` cursors next to the standard
+        `code`, `message` and `data` keys.
+        """
+        response = self.create_response(code, message, data, status_code)
+        response.data["next"] = paginator.next_cursor
+        response.data["prev"] = paginator.prev_cursor
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET (ETag / Last-Modified) support for APIViews.
+
+    The view derives a version from cheap aggregates (row count, max(updated_at))
+    before serializing anything. If it matches the client's If-None-Match /
+    If-Modified-Since, a 304 is returned without running the serializer;
+    otherwise the validators are stamped on the full response.
+
+    Usage:
+        etag = self.get_etag(request, count, last_updated)
+        not_modified = self.get_not_modified_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        ...
+        return self.set_validators(response, etag=etag)
+    """
+
+    def get_etag(self, request, *version):
+        """
+        Builds a strong ETag from the version parts, the requester and the query
+        string, since the same URL returns different data to different users.
+        """
+        key = repr((request.user.pk, request.get_full_path(), *version))
+        return '"%s"' % hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def get_not_modified_response(self, request, etag=None, last_modified=None):
+        """Returns a 304 response if the client's cached copy is current, otherwise None."""
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is not None:
+            self.set_validators(response, etag, last_modified)
+        return response
+
+    def set_validators(self, response, etag=None, last_modified=None):
+        if etag:
+            response.headers['ETag'] = etag
+        if last_modified:
+            response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+        # Per-user data: only private caches, and always revalidate
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Authorization',))
+        return response
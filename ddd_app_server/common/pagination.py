@@ -0,0 +1,122 @@
+import base64
+import binascii
+import json
+from functools import reduce
+
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor query parameter cannot be decoded."""
+
+
+class KeysetCursorPagination:
+    """
+    Keyset (seek) pagination over a fixed, unique ordering.
+
+    The cursor is an opaque token holding the ordering values of the row at the
+    page boundary, so every page is fetched with a range predicate on the
+    ordering columns instead of an OFFSET. With the ordering columns on the
+    paginated table and one index over them (e.g. Attendance's
+    (schedule_start_time, id)), fetching page N costs the same as fetching
+    page 1.
+
+    Usage:
+        paginator = KeysetCursorPagination(ordering=('schedule_start_time', 'id'))
+        page = paginator.paginate_queryset(queryset, request)
+        paginator.next_cursor, paginator.prev_cursor
+    """
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = 50
+    max_limit = 200
+
+    def __init__(self, ordering, default_limit=None, max_limit=None):
+        self.ordering = tuple(ordering)
+        if default_limit is not None:
+            self.default_limit = default_limit
+        if max_limit is not None:
+            self.max_limit = max_limit
+        self.next_cursor = None
+        self.prev_cursor = None
+
+    def get_limit(self, request):
+        value = request.query_params.get(self.limit_query_param)
+        if not value:
+            return self.default_limit
+        limit = int(value)
+        if limit <= 0:
+            raise ValueError("limit must be a positive integer.")
+        return min(limit, self.max_limit)
+
+    def decode_cursor(self, request):
+        """Returns (values, reverse) for the requested cursor, or (None, False)."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            values, reverse = payload['v'], bool(payload['r'])
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+            raise InvalidCursor("Invalid cursor.")
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise InvalidCursor("Invalid cursor.")
+        return values, reverse
+
+    def encode_cursor(self, values, reverse):
+        payload = json.dumps({'v': values, 'r': reverse}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii').rstrip('=')
+
+    def _position(self, obj):
+        values = []
+        for lookup in self.ordering:
+            if isinstance(obj, dict) and lookup in obj:
+                # Flat .values() row
+                value = obj[lookup]
+            else:
+                value = obj
+                for attr in lookup.split('__'):
+                    value = value[attr] if isinstance(value, dict) else getattr(value, attr)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        return values
+
+    def _seek_filter(self, values, forward):
+        """
+        Builds the row-value comparison `(a, b, ...) > (x, y, ...)` (or `<`) as
+        nested OR/AND predicates so it works on every database backend.
+        """
+        lookup_type = 'gt' if forward else 'lt'
+        clauses = []
+        for index, lookup in enumerate(self.ordering):
+            equal = {field: values[i] for i, field in enumerate(self.ordering[:index])}
+            clauses.append(Q(**equal, **{f'{lookup}__{lookup_type}': values[index]}))
+        return reduce(lambda left, right: left | right, clauses)
+
+    def paginate_queryset(self, queryset, request):
+        limit = self.get_limit(request)
+        values, reverse = self.decode_cursor(request)
+
+        if reverse:
+            order_by = [f'-{lookup}' for lookup in self.ordering]
+        else:
+            order_by = list(self.ordering)
+        queryset = queryset.order_by(*order_by)
+        if values is not None:
+            queryset = queryset.filter(self._seek_filter(values, forward=not reverse))
+
+        # Fetch one extra row to learn whether another page exists.
+        rows = list(queryset[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if reverse:
+            rows.reverse()
+
+        self.next_cursor = None
+        self.prev_cursor = None
+        if rows:
+            if has_more or reverse:
+                self.next_cursor = self.encode_cursor(self._position(rows[-1]), False)
+            if values is not None and (has_more or not reverse):
+                self.prev_cursor = self.encode_cursor(self._position(rows[0]), True)
+        return rows
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+MODERATOR_GROUP = "moderator"
+
+
+def is_moderator(user):
+    """
+    Returns whether the user belongs to the "moderator" group.
+
+    The answer is memoized on the user object only: request.user lives for a
+    single request, so a membership change applies from the next request on
+    every worker.
+    """
+    if user is None or not user.is_authenticated:
+        return False
+
+    memo = getattr(user, '_is_moderator', None)
+    if memo is None:
+        memo = user._is_moderator = user.groups.filter(name=MODERATOR_GROUP).exists()
+    return memo
+
+
+def is_staff_or_moderator(user):
+    """Returns whether the user is staff or a moderator."""
+    return bool(user is not None and user.is_authenticated and (user.is_staff or is_moderator(user)))
+
+
+def staff_or_moderator_ids(user_ids):
+    """Returns the subset of user_ids that are staff or moderators, in a single query."""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return set()
+    return set(
+        get_user_model().objects
+        .filter(Q(is_staff=True) | Q(groups__name=MODERATOR_GROUP), pk__in=user_ids)
+        .values_list('pk', flat=True)
+        .distinct()
+    )
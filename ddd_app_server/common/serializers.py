@@ -1,3 +1,7 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.db.models import prefetch_related_objects
+from drf_yasg import openapi
 from rest_framework import serializers
 
 # 공통 응답용 Serializer (공통)
@@ -11,3 +15,200 @@ class ErrorResponseSerializer(serializers.Serializer):
     code = serializers.IntegerField()
     message = serializers.CharField()
     data = serializers.JSONField(allow_null=True)
+
+
+# 목록 직렬화 시 중첩 데이터를 일괄 로딩하는 ListSerializer (공통)
+class PrefetchListSerializer(serializers.ListSerializer):
+    """
+    Loads the related objects the child serializer needs for the whole list
+    up front, in a fixed number of queries, instead of once per row.
+
+    The child serializer declares the lookups per output field:
+
+        prefetch_lookups = {
+            'profile_summary': ('user__profile', 'user__groups'),
+        }
+
+    and sets `list_serializer_class = PrefetchListSerializer` in its Meta.
+    Lookups already satisfied by the queryset (select_related/prefetch_related)
+    are skipped by Django.
+    """
+
+    def get_prefetch_lookups(self):
+        lookups = getattr(self.child, 'prefetch_lookups', {})
+        return [
+            lookup
+            for field_name, field_lookups in lookups.items()
+            if field_name in self.child.fields
+            for lookup in field_lookups
+        ]
+
+    def to_representation(self, data):
+        instances = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        lookups = self.get_prefetch_lookups()
+        if instances and lookups:
+            prefetch_related_objects(instances, *lookups)
+        return super().to_representation(instances)
+
+
+# 요청한 필드만 직렬화하는 Mixin (Sparse Fieldsets, 공통)
+class SparseFieldsetMixin:
+    """
+    Limits the serializer to the fields named in the request's `fields` query
+    param, or drops those named in `exclude` (comma separated):
+
+        GET /api/v1/attendances/?fields=id,status
+        GET /api/v1/profiles/me/?exclude=is_staff
+
+    Unrequested fields are removed from `self.fields` before serialization, so
+    their SerializerMethodFields never run and PrefetchListSerializer skips
+    their prefetches. Only applies to safe (read) requests and to serializers
+    constructed with the request in their context, i.e. the top-level ones;
+    nested serializers keep their full shape. Unknown names are ignored.
+    """
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.omitted_fields = set()
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return
+
+        requested = self._parse_field_names(request, self.fields_query_param)
+        excluded = self._parse_field_names(request, self.exclude_query_param)
+        for field_name in list(self.fields):
+            if (requested and field_name not in requested) or field_name in excluded:
+                self.fields.pop(field_name)
+                self.omitted_fields.add(field_name)
+
+    @staticmethod
+    def _parse_field_names(request, param):
+        value = request.query_params.get(param, '')
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+
+# Swagger 문서용 sparse fieldset 쿼리 파라미터
+SPARSE_FIELDSET_PARAMETERS = [
+    openapi.Parameter(SparseFieldsetMixin.fields_query_param, openapi.IN_QUERY, description="응답에 포함할 필드 (쉼표로 구분, 예: id,status)", type=openapi.TYPE_STRING),
+    openapi.Parameter(SparseFieldsetMixin.exclude_query_param, openapi.IN_QUERY, description="응답에서 제외할 필드 (쉼표로 구분)", type=openapi.TYPE_STRING),
+]
+
+
+# 읽기 전용 목록 직렬화를 위한 컴파일된 row mapper (공통)
+class Column:
+    """Compiled source of a field: a values() lookup relative to the serializer's model."""
+
+    def __init__(self, lookup, default=None):
+        self.lookup = lookup
+        self.default = default
+
+
+class Nested:
+    """Compiled nested serializer over a forward relation; None when the related row is missing."""
+
+    def __init__(self, relation, serializer_class):
+        self.relation = relation
+        self.serializer_class = serializer_class
+
+
+class CompiledRowMapper:
+    """
+    Read-only fast path for ModelSerializer lists.
+
+    Compiles a serializer's field list (after sparse fieldset pruning) once
+    into flat getters over the rows of a single `.values()` query, skipping
+    DRF's per-row field walk, attribute access and nested serializer
+    instantiation. The output is identical to `serializer.data`.
+
+    Plain model fields compile from their `source`. Method fields and fields
+    the serializer computes itself are described on the serializer class:
+
+        compiled_fields = {
+            'profile_summary': Nested('user__profile', ProfileSummarySerializer),
+            'team': Column('user__member_attribute__team', default=''),
+        }
+
+    and keys its to_representation() adds beyond its declared fields in
+    `compiled_extra_fields` ({key: Column(...)}).
+
+    Usage:
+        mapper = CompiledRowMapper.for_serializer(AttendanceSerializer(context={'request': request}))
+        rows = queryset.values(*mapper.lookups)
+        data = mapper.to_representation(rows)
+    """
+    # Fields whose to_representation() returns database values of these types unchanged
+    IDENTITY_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField, serializers.ChoiceField)
+
+    _cache = {}
+
+    def __init__(self, serializer):
+        self.lookups = []
+        self._getters = self._compile(serializer, prefix='')
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        """Returns the mapper for the serializer's class and (sparse) field list, compiling it once."""
+        key = (type(serializer), tuple(serializer.fields), frozenset(getattr(serializer, 'omitted_fields', ())))
+        mapper = cls._cache.get(key)
+        if mapper is None:
+            mapper = cls._cache[key] = cls(serializer)
+        return mapper
+
+    def to_representation(self, rows):
+        getters = self._getters
+        return [{name: getter(row) for name, getter in getters} for row in rows]
+
+    def _add_lookup(self, lookup):
+        if lookup not in self.lookups:
+            self.lookups.append(lookup)
+
+    def _column(self, lookup, field=None, default=None):
+        self._add_lookup(lookup)
+        if field is None or isinstance(field, self.IDENTITY_FIELDS):
+            def getter(row):
+                value = row[lookup]
+                return default if value is None else value
+        else:
+            convert = field.to_representation
+
+            def getter(row):
+                value = row[lookup]
+                return default if value is None else convert(value)
+        return getter
+
+    def _nested(self, spec, prefix):
+        relation = f'{prefix}{spec.relation}__'
+        presence = relation + spec.serializer_class.Meta.model._meta.pk.name
+        self._add_lookup(presence)
+        getters = self._compile(spec.serializer_class(), relation)
+
+        def getter(row):
+            if row[presence] is None:
+                return None
+            return {name: nested_getter(row) for name, nested_getter in getters}
+        return getter
+
+    def _compile(self, serializer, prefix):
+        compiled_fields = getattr(serializer, 'compiled_fields', {})
+        getters = []
+        for name, field in serializer.fields.items():
+            spec = compiled_fields.get(name)
+            if isinstance(spec, Nested):
+                getter = self._nested(spec, prefix)
+            elif isinstance(spec, Column):
+                getter = self._column(prefix + spec.lookup, field, spec.default)
+            elif isinstance(field, (serializers.SerializerMethodField, serializers.BaseSerializer)) or field.source == '*':
+                raise ImproperlyConfigured(
+                    f"{type(serializer).__name__}.{name} cannot be compiled; declare it in compiled_fields."
+                )
+            else:
+                getter = self._column(prefix + '__'.join(field.source_attrs), field)
+            getters.append((name, getter))
+
+        omitted = getattr(serializer, 'omitted_fields', ())
+        for name, spec in getattr(serializer, 'compiled_extra_fields', {}).items():
+            if name not in serializer.fields and name not in omitted:
+                getters.append((name, self._column(prefix + spec.lookup, default=spec.default)))
+        return getters
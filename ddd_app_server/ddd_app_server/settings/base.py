@@ -58,6 +58,7 @@ INSTALLED_APPS = [
     'schedules',
     'attendances',
     'invites',
+    'sync',
 ]
 
 MIDDLEWARE = [
@@ -159,6 +160,23 @@ REST_FRAMEWORK = {
     ),
 }
 
+# QR code settings
+QRCODE_TTL = int(os.getenv('QRCODE_TTL', 300))  # seconds a generated QR code stays valid
+# Stateless signed QR tokens (qrcodes.tokens) instead of one QRLog row per generated code
+QRCODE_TOKEN_MODE = os.getenv('QRCODE_TOKEN_MODE', 'False').lower() == 'true'
+# Long-poll of a QR code's status (qrcodes/<id>/status/): longest wait and re-check interval, in seconds
+QRCODE_STATUS_MAX_WAIT = int(os.getenv('QRCODE_STATUS_MAX_WAIT', 30))
+QRCODE_STATUS_POLL_INTERVAL = float(os.getenv('QRCODE_STATUS_POLL_INTERVAL', 1))
+# Expired/consumed QR logs are kept this long past expiry before purge_qr_logs deletes them (seconds)
+QRCODE_RETENTION_GRACE = int(os.getenv('QRCODE_RETENTION_GRACE', 86400))
+
+# Delta sync (sync app): deletions are remembered this many days; older watermarks get a full sync
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+
+# Per-worker schedule timeline (schedules.timeline): rebuilt at least this often (seconds) to see
+# schedule changes made by other workers
+SCHEDULE_TIMELINE_TTL = int(os.getenv('SCHEDULE_TIMELINE_TTL', 60))
+
 # JWT settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=int(os.getenv('JWT_ACCESS_TOKEN_LIFETIME', 365))),
@@ -34,6 +34,7 @@ urlpatterns = [
         path('schedules/', include('schedules.urls')),
         path('attendances/', include('attendances.urls')),
         path('invites/', include('invites.urls')),
+        path('sync/', include('sync.urls')),
     ])),
     
     # # JWT Token Refresh
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Profile
+from .models import Profile, MemberAttribute
 from django.contrib.auth.models import Group
 import random
 
@@ -39,3 +39,12 @@ class ProfileAdmin(admin.ModelAdmin):
         return obj.user.email
 
 admin.site.register(Profile, ProfileAdmin)
+
+
+class MemberAttributeAdmin(admin.ModelAdmin):
+    list_display = ('user', 'role', 'team', 'responsibility', 'cohort', 'updated_at')
+    search_fields = ('user__username', 'user__email')
+    list_filter = ('role', 'team', 'cohort')
+    readonly_fields = ('user', 'role', 'team', 'responsibility', 'cohort', 'updated_at')
+
+admin.site.register(MemberAttribute, MemberAttributeAdmin)
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+GROUP_PREFIXES = {
+    'role': 'role:',
+    'team': 'team:',
+    'responsibility': 'responsibility:',
+    'cohort': 'cohort:',
+}
+
+
+def backfill_member_attributes(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    MemberAttribute = apps.get_model('profiles', 'MemberAttribute')
+
+    values = {}
+    memberships = User.groups.through.objects.order_by('id').values_list('user_id', 'group__name')
+    for user_id, name in memberships.iterator(chunk_size=2000):
+        row = values.setdefault(user_id, {field: '' for field in GROUP_PREFIXES})
+        for field, prefix in GROUP_PREFIXES.items():
+            if not row[field] and name.startswith(prefix):
+                row[field] = name[len(prefix):]
+
+    MemberAttribute.objects.bulk_create(
+        [MemberAttribute(user_id=user_id, **row) for user_id, row in values.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('profiles', '0004_remove_profile_cohort_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberAttribute',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='member_attribute', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('role', models.CharField(blank=True, db_index=True, default='', max_length=150)),
+                ('team', models.CharField(blank=True, db_index=True, default='', max_length=150)),
+                ('responsibility', models.CharField(blank=True, default='', max_length=150)),
+                ('cohort', models.CharField(blank=True, db_index=True, default='', max_length=150)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_member_attributes, migrations.RunPython.noop),
+    ]
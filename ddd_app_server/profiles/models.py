@@ -19,6 +19,67 @@ class Profile(models.Model):
         ordering = ['-created_at']
 
 
+class MemberAttribute(models.Model):
+    """
+    Denormalized projection of a user's prefixed groups ("role:", "team:",
+    "responsibility:", "cohort:") into typed, indexed columns.
+    Kept in sync from the group membership signals in profiles.signals.
+    """
+    GROUP_PREFIXES = {
+        'role': 'role:',
+        'team': 'team:',
+        'responsibility': 'responsibility:',
+        'cohort': 'cohort:',
+    }
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='member_attribute')
+    role = models.CharField(max_length=150, blank=True, default='', db_index=True)
+    team = models.CharField(max_length=150, blank=True, default='', db_index=True)
+    responsibility = models.CharField(max_length=150, blank=True, default='')
+    cohort = models.CharField(max_length=150, blank=True, default='', db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id} ({self.role}/{self.team}/{self.responsibility}/{self.cohort})"
+
+    @classmethod
+    def values_from_group_names(cls, group_names):
+        """Maps group names to attribute values; the first group per prefix wins."""
+        values = {field: '' for field in cls.GROUP_PREFIXES}
+        for name in group_names:
+            for field, prefix in cls.GROUP_PREFIXES.items():
+                if not values[field] and name.startswith(prefix):
+                    values[field] = name[len(prefix):]
+        return values
+
+    @classmethod
+    def sync_users(cls, user_ids):
+        """Recomputes the projection rows for the given users in two queries."""
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+
+        group_names = {user_id: [] for user_id in user_ids}
+        prefix_filter = models.Q()
+        for prefix in cls.GROUP_PREFIXES.values():
+            prefix_filter |= models.Q(group__name__startswith=prefix)
+        memberships = (
+            User.groups.through.objects
+            .filter(prefix_filter, user_id__in=user_ids)
+            .order_by('id')
+            .values_list('user_id', 'group__name')
+        )
+        for user_id, name in memberships:
+            group_names[user_id].append(name)
+
+        cls.objects.bulk_create(
+            [cls(user_id=user_id, **cls.values_from_group_names(names)) for user_id, names in group_names.items()],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=[*cls.GROUP_PREFIXES, 'updated_at'],
+        )
+
+
 class Cohort(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255)
@@ -1,7 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth.models import Group
+from django.db import transaction
 from django.contrib.auth import get_user_model
-from profiles.models import Profile
+from profiles.models import Profile, MemberAttribute
+from common.roles import is_staff_or_moderator
+from common.serializers import Column, SparseFieldsetMixin
 from invites.models import InviteCode
 from django.utils import timezone
 
@@ -15,7 +18,7 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user_id = serializers.IntegerField(source='user.id', read_only=True)
     invite_code_id = serializers.UUIDField(required=False, allow_null=True)
     name = serializers.CharField(required=False, allow_null=True, allow_blank=True)
@@ -25,24 +28,32 @@ class ProfileSerializer(serializers.ModelSerializer):
     cohort = serializers.CharField(required=False, allow_null=True, allow_blank=True)
     is_staff = serializers.SerializerMethodField()
 
+    # Read-only fast path, see CompiledRowMapper. Group-based fields come from the
+    # MemberAttribute projection and are always rendered (see to_representation).
+    compiled_fields = {
+        field_name: Column(f'user__member_attribute__{field_name}', default='')
+        for field_name in MemberAttribute.GROUP_PREFIXES
+    }
+    compiled_extra_fields = compiled_fields
+
     class Meta:
         model = Profile
         fields = ['id', 'user_id', 'name', 'invite_code_id', 'role', 'team', 'responsibility', 'cohort', 'is_staff', 'created_at', 'updated_at']
         read_only_fields = ['id', 'user_id', 'created_at', 'is_staff', 'updated_at']
 
     def get_is_staff(self, obj):
-        return obj.user.is_staff or obj.user.groups.filter(name="moderator").exists()
+        return is_staff_or_moderator(obj.user)
 
     def to_representation(self, instance):
         """Customize the serialized output."""
         representation = super().to_representation(instance)
-        user_groups = instance.user.groups.all()
 
-        # Extract group-based fields
-        representation['role'] = self._extract_group_value(user_groups, "role:")
-        representation['team'] = self._extract_group_value(user_groups, "team:")
-        representation['responsibility'] = self._extract_group_value(user_groups, "responsibility:")
-        representation['cohort'] = self._extract_group_value(user_groups, "cohort:")
+        # Group-based fields are read from the MemberAttribute projection
+        group_fields = [field_name for field_name in MemberAttribute.GROUP_PREFIXES if field_name not in self.omitted_fields]
+        if group_fields:
+            member_attribute = getattr(instance.user, 'member_attribute', None)
+            for field_name in group_fields:
+                representation[field_name] = getattr(member_attribute, field_name, "")
 
         # Include invite_code_id if available
         if 'invite_code_id' in representation:
@@ -50,8 +61,12 @@ class ProfileSerializer(serializers.ModelSerializer):
 
         return representation
 
+    @transaction.atomic
     def update(self, instance, validated_data):
-        """Update the profile and manage related groups."""
+        """
+        Update the profile and manage related groups.
+        Runs in one transaction so the group changes are reconciled into attendances once, on commit.
+        """
         request_user = self.context['request'].user
 
         # Update basic fields
@@ -70,11 +85,6 @@ class ProfileSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
-    def _extract_group_value(self, user_groups, prefix):
-        """Extract the value of a group based on its prefix."""
-        group = next((g for g in user_groups if g.name.startswith(prefix)), None)
-        return group.name.split(":", 1)[1] if group else ""
-
     def _update_field(self, instance, validated_data, field_name):
         """Update a field on the instance if provided in validated_data."""
         if field_name in validated_data and validated_data[field_name]:
@@ -113,6 +123,11 @@ class ProfileSerializer(serializers.ModelSerializer):
             user.groups.add(group)
 
 
+# Lookups (relative to an object with a `user` relation) that let
+# ProfileSummarySerializer render without issuing further queries.
+PROFILE_SUMMARY_PREFETCH = ('user__profile', 'user__member_attribute')
+
+
 class ProfileSummarySerializer(ProfileSerializer):
     class Meta:
         model = Profile
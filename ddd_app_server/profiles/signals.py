@@ -1,8 +1,8 @@
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_save, pre_delete, post_delete
 from django.dispatch import receiver
-from django.contrib.auth.models import User
-from .models import Profile
+from django.contrib.auth.models import User, Group
+from .models import Profile, MemberAttribute
 
 @receiver(post_save, sender=User)
 def update_profile(sender, instance, created, **kwargs):
@@ -13,3 +13,44 @@ def update_profile(sender, instance, created, **kwargs):
         user=instance,
         defaults={'name': instance.get_full_name() or instance.username}
     )
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def sync_member_attributes_on_groups_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep MemberAttribute in sync when group memberships change, from either
+    side (user.groups.add(...) or group.user_set.add(...)).
+    """
+    if action == 'pre_clear' and reverse:
+        # group.user_set.clear(): remember the members before the rows are gone
+        instance._affected_user_ids = list(instance.user_set.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        user_ids = [instance.pk]
+    elif action == 'post_clear':
+        user_ids = getattr(instance, '_affected_user_ids', [])
+    else:
+        user_ids = pk_set or []
+    MemberAttribute.sync_users(user_ids)
+
+
+@receiver(post_save, sender=Group)
+def sync_member_attributes_on_group_save(sender, instance, created, **kwargs):
+    """A renamed group changes the attribute values of all of its members."""
+    if not created:
+        user_ids = list(instance.user_set.values_list('pk', flat=True))
+        MemberAttribute.sync_users(user_ids)
+
+
+@receiver(pre_delete, sender=Group)
+def collect_group_members_before_delete(sender, instance, **kwargs):
+    instance._affected_user_ids = list(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Group)
+def sync_member_attributes_on_group_delete(sender, instance, **kwargs):
+    user_ids = getattr(instance, '_affected_user_ids', [])
+    MemberAttribute.sync_users(user_ids)
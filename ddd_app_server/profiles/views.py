@@ -4,9 +4,11 @@ from rest_framework import permissions, status, serializers
 from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from drf_yasg.utils import swagger_auto_schema
-from common.mixins import BaseResponseMixin
-from common.serializers import ErrorResponseSerializer
+from common.mixins import BaseResponseMixin, ConditionalGetMixin
+from common.roles import is_staff_or_moderator
+from common.serializers import ErrorResponseSerializer, SPARSE_FIELDSET_PARAMETERS
 from .mixins import CurrentProfileMixin
+from .models import MemberAttribute
 from .serializers import ProfileSerializer
 
 logger = logging.getLogger(__name__)
@@ -18,16 +20,21 @@ class ProfileSuccesSerializer(serializers.Serializer):
     data = ProfileSerializer()
 
 # 특정 사용자 프로필 조회 APIView
-class ProfileDetailView(BaseResponseMixin, CurrentProfileMixin, APIView):
+class ProfileDetailView(ConditionalGetMixin, BaseResponseMixin, CurrentProfileMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
     authentication_classes = [JWTAuthentication]
 
     @swagger_auto_schema(
         tags=["profiles"],
         operation_summary="프로필 조회",
-        operation_description="프로필 정보를 조회합니다.",
+        operation_description="""
+        프로필 정보를 조회합니다.
+        응답의 ETag(If-None-Match) 또는 Last-Modified(If-Modified-Since)를 전달하면, 변경 사항이 없을 때 304 Not Modified를 반환합니다.
+        """,
+        manual_parameters=SPARSE_FIELDSET_PARAMETERS,
         responses={
             200: ProfileSuccesSerializer,
+            304: "변경 사항 없음 (Not Modified)",
             400: ErrorResponseSerializer
         },
     )
@@ -35,11 +42,34 @@ class ProfileDetailView(BaseResponseMixin, CurrentProfileMixin, APIView):
         profile_id = self.kwargs.get('profile_id', 'me')
         try:
             profile = self.get_profile(profile_id)
-            serializer = ProfileSerializer(profile)
-            return self.create_response(200, "프로필 정보를 성공적으로 조회했습니다.", serializer.data)
         except Http404:
             return self.create_response(404, "프로필을 찾을 수 없습니다.", None, status.HTTP_404_NOT_FOUND)
 
+        # 변경 사항이 없으면 직렬화 없이 304 반환
+        etag, last_modified = self.get_validators(profile)
+        not_modified = self.get_not_modified_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = ProfileSerializer(profile, context={'request': request})
+        response = self.create_response(200, "프로필 정보를 성공적으로 조회했습니다.", serializer.data)
+        return self.set_validators(response, etag=etag, last_modified=last_modified)
+
+    def get_validators(self, profile):
+        """
+        Returns (etag, last_modified) of a profile. Group based fields live in
+        MemberAttribute, which is touched on every membership change.
+        """
+        try:
+            member_attribute = profile.user.member_attribute
+        except MemberAttribute.DoesNotExist:
+            member_attribute = None
+        member_updated_at = member_attribute.updated_at if member_attribute else None
+
+        last_modified = max(filter(None, (profile.updated_at, member_updated_at)))
+        etag = self.get_etag(self.request, profile.pk, profile.updated_at, member_updated_at, profile.user.is_staff)
+        return etag, last_modified
+
     @swagger_auto_schema(
         tags=["profiles"],
         operation_summary="프로필 수정",
@@ -57,7 +87,7 @@ class ProfileDetailView(BaseResponseMixin, CurrentProfileMixin, APIView):
 
         # Permission Check: Is the requester the owner or staff?
         is_owner = (profile.user == request.user)
-        is_staff = (request.user.is_staff or request.user.groups.filter(name="moderator").exists())
+        is_staff = is_staff_or_moderator(request.user)
 
         # Check if the user is the owner or a moderator
         if not (is_owner or is_staff):
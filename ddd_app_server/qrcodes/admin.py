@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import QRLog
+from .models import QRLog, QRNonce, QRDailyRollup
 
 class QRLogAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "created_at", "expires_at", "decoded_at")
@@ -7,3 +7,19 @@ class QRLogAdmin(admin.ModelAdmin):
     list_filter = ("created_at", "expires_at", "decoded_at")
 
 admin.site.register(QRLog, QRLogAdmin)
+
+
+class QRNonceAdmin(admin.ModelAdmin):
+    list_display = ("nonce", "user", "consumed_at")
+    search_fields = ("user__username",)
+    list_filter = ("consumed_at",)
+
+admin.site.register(QRNonce, QRNonceAdmin)
+
+
+class QRDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ("day", "user", "issued_count", "used_count", "expired_count")
+    search_fields = ("user__username",)
+    list_filter = ("day",)
+
+admin.site.register(QRDailyRollup, QRDailyRollupAdmin)
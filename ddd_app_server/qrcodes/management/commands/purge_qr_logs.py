@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from qrcodes.retention import DEFAULT_BATCH_SIZE, purge_qr_logs, purge_qr_nonces, purgeable, purgeable_nonces
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete QR logs and QR token nonces that expired more than the retention "
+        "grace period ago, in small batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace', type=int, default=settings.QRCODE_RETENTION_GRACE,
+            help="Seconds past expiry a QR log or token nonce is kept (default: QRCODE_RETENTION_GRACE).",
+        )
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Rows deleted per transaction.")
+        parser.add_argument('--pause', type=float, default=0, help="Seconds to sleep between batches.")
+        parser.add_argument('--no-rollup', action='store_true', help="Do not fold deleted rows into the daily rollup.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many rows would be deleted.")
+
+    def handle(self, *args, **options):
+        grace = timedelta(seconds=options['grace'])
+        if options['dry_run']:
+            count = purgeable(now() - grace).count()
+            nonce_count = purgeable_nonces(now() - grace).count()
+            self.stdout.write(f"{count} QR log(s) and {nonce_count} token nonce(s) would be deleted.")
+            return
+
+        deleted = purge_qr_logs(
+            grace=grace,
+            batch_size=options['batch_size'],
+            rollup=not options['no_rollup'],
+            pause=options['pause'],
+        )
+        deleted_nonces = purge_qr_nonces(grace=grace, batch_size=options['batch_size'], pause=options['pause'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} QR log(s) and {deleted_nonces} token nonce(s)."))
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qrcodes', '0003_alter_qrlog_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='qrlog',
+            index=models.Index(fields=['user', '-created_at'], name='qrlog_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qrcodes', '0004_qrlog_user_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QRDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('issued_count', models.PositiveIntegerField(default=0)),
+                ('used_count', models.PositiveIntegerField(default=0)),
+                ('expired_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-day', 'user'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='qrlog',
+            index=models.Index(fields=['expires_at'], name='qrlog_expires_idx'),
+        ),
+        migrations.AddField(
+            model_name='qrdailyrollup',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='qr_daily_rollups', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='qrdailyrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'day'), name='qrrollup_unique_user_day'),
+        ),
+    ]
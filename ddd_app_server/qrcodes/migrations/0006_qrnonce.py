@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-18 14:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qrcodes', '0005_qrlog_retention'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QRNonce',
+            fields=[
+                ('nonce', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('consumed_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='qr_nonces', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['consumed_at'], name='qrnonce_consumed_idx')],
+            },
+        ),
+    ]
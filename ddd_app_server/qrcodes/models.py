@@ -1,8 +1,21 @@
 import uuid
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils.timezone import now
 # Create your models here.
 
+
+class QRLogQuerySet(models.QuerySet):
+    def consume(self, pk, at=None):
+        """
+        Marks the QR code as used with a single conditional UPDATE
+        (decoded_at IS NULL AND expires_at > now). Returns True only for the one
+        caller whose update matched, so concurrent scans cannot both succeed.
+        """
+        at = at or now()
+        return self.filter(pk=pk, decoded_at__isnull=True, expires_at__gt=at).update(decoded_at=at) == 1
+
+
 # QR 로그 모델
 class QRLog(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -10,3 +23,45 @@ class QRLog(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(null=True, blank=True)
     decoded_at = models.DateTimeField(null=True, blank=True)
+
+    objects = QRLogQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # A user's QR history, newest first
+            models.Index(fields=['user', '-created_at'], name='qrlog_user_created_idx'),
+            # Retention purge scans by expiry (qrcodes.retention)
+            models.Index(fields=['expires_at'], name='qrlog_expires_idx'),
+        ]
+
+
+# 토큰 모드에서 사용된 QR 토큰의 nonce (재사용 방지)
+# nonce가 기본 키이므로 동시에 같은 토큰을 사용해도 INSERT는 하나만 성공
+class QRNonce(models.Model):
+    nonce = models.UUIDField(primary_key=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='qr_nonces')
+    consumed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # Retention purge scans by consumption time (qrcodes.retention)
+            models.Index(fields=['consumed_at'], name='qrnonce_consumed_idx'),
+        ]
+
+
+# 삭제된 QR 로그의 사용자별 일일 집계 (감사용)
+class QRDailyRollup(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='qr_daily_rollups')
+    day = models.DateField()
+    issued_count = models.PositiveIntegerField(default=0)
+    used_count = models.PositiveIntegerField(default=0)
+    expired_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day'], name='qrrollup_unique_user_day'),
+        ]
+        ordering = ['-day', 'user']
+
+    def __str__(self):
+        return f"{self.user} {self.day}: {self.used_count}/{self.issued_count}"
@@ -0,0 +1,124 @@
+# qrcodes/retention.py
+"""
+Retention of the QRLog table.
+
+A QR code is useless once it has expired, so purge_qr_logs() deletes codes
+whose expiry lies more than a grace period in the past. Rows are deleted in
+bounded batches, each in its own short transaction, so the write lock is
+never held for long and the scanners keep working during a purge. Before a
+batch is deleted, it can be folded into QRDailyRollup (counts per user per
+day) so the history stays available for audit.
+
+Consumed token nonces (QRNonce, QRCODE_TOKEN_MODE) are only needed while
+their token could still be replayed, and are purged the same way.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils.timezone import now
+
+from .models import QRLog, QRNonce, QRDailyRollup
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def purgeable(cutoff):
+    """QR logs that expired before cutoff (rows without an expiry count from their creation)."""
+    return QRLog.objects.filter(
+        Q(expires_at__lt=cutoff) | Q(expires_at__isnull=True, created_at__lt=cutoff)
+    )
+
+
+def purgeable_nonces(cutoff):
+    """Consumed token nonces whose token expired before cutoff."""
+    # A token is consumed after it was issued, so it expires within QRCODE_TTL of consumed_at
+    return QRNonce.objects.filter(consumed_at__lt=cutoff - timedelta(seconds=settings.QRCODE_TTL))
+
+
+def _rollup(pks):
+    rows = (
+        QRLog.objects.filter(pk__in=pks)
+        .annotate(day=TruncDate('created_at'))
+        .values('user_id', 'day')
+        .annotate(issued=Count('id'), used=Count('id', filter=Q(decoded_at__isnull=False)))
+    )
+    counts = {(row['user_id'], row['day']): (row['issued'], row['used']) for row in rows}
+    if not counts:
+        return
+
+    existing = {
+        (rollup.user_id, rollup.day): rollup
+        for rollup in QRDailyRollup.objects.filter(
+            user_id__in={user_id for user_id, _ in counts},
+            day__in={day for _, day in counts},
+        )
+    }
+    created = []
+    for key, (issued, used) in counts.items():
+        rollup = existing.get(key)
+        if rollup is None:
+            rollup = QRDailyRollup(user_id=key[0], day=key[1])
+            created.append(rollup)
+        rollup.issued_count += issued
+        rollup.used_count += used
+        rollup.expired_count += issued - used
+
+    QRDailyRollup.objects.bulk_update(
+        [rollup for key, rollup in existing.items() if key in counts],
+        ['issued_count', 'used_count', 'expired_count'],
+    )
+    QRDailyRollup.objects.bulk_create(created)
+
+
+def purge_qr_logs(grace=None, batch_size=DEFAULT_BATCH_SIZE, rollup=True, pause=0):
+    """
+    Deletes QR logs that expired more than `grace` (a timedelta, default
+    QRCODE_RETENTION_GRACE) ago, batch_size rows per transaction, sleeping
+    `pause` seconds between batches. Returns the number of deleted rows.
+    """
+    if grace is None:
+        grace = timedelta(seconds=settings.QRCODE_RETENTION_GRACE)
+    cutoff = now() - grace
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            pks = list(purgeable(cutoff).values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            if rollup:
+                _rollup(pks)
+            QRLog.objects.filter(pk__in=pks).delete()
+        deleted += len(pks)
+        if len(pks) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return deleted
+
+
+def purge_qr_nonces(grace=None, batch_size=DEFAULT_BATCH_SIZE, pause=0):
+    """
+    Deletes consumed token nonces whose token expired more than `grace`
+    (default QRCODE_RETENTION_GRACE) ago, like purge_qr_logs(). Returns the
+    number of deleted rows.
+    """
+    if grace is None:
+        grace = timedelta(seconds=settings.QRCODE_RETENTION_GRACE)
+    cutoff = now() - grace
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            pks = list(purgeable_nonces(cutoff).values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            QRNonce.objects.filter(pk__in=pks).delete()
+        deleted += len(pks)
+        if len(pks) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return deleted
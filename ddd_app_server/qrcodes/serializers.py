@@ -8,3 +8,20 @@ class QRLogSerializer(serializers.ModelSerializer):
         model = QRLog
         fields = ['id', 'user', 'qr_string', 'created_at', 'expires_at', 'decoded_at']
         read_only_fields = ['id', 'user', 'qr_string', 'created_at', 'decoded_at']
+
+
+class QRTokenSerializer(serializers.Serializer):
+    """Same shape as QRLogSerializer for a stateless token (QRCODE_TOKEN_MODE); `id` is the token nonce."""
+    id = serializers.UUIDField()
+    user = serializers.IntegerField(source='user_id')
+    qr_string = serializers.CharField()
+    created_at = serializers.DateTimeField()
+    expires_at = serializers.DateTimeField()
+    decoded_at = serializers.DateTimeField(allow_null=True, default=None)
+
+
+class QRCodeStatusSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    status = serializers.ChoiceField(choices=['pending', 'used', 'expired'], help_text="pending: 아직 사용되지 않음, used: 사용됨, expired: 만료됨")
+    expires_at = serializers.DateTimeField(allow_null=True)
+    decoded_at = serializers.DateTimeField(allow_null=True)
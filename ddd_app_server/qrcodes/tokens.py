@@ -0,0 +1,93 @@
+"""
+Stateless QR tokens (QRCODE_TOKEN_MODE).
+
+A token is a signed (user_id, issued_at, nonce) payload, so it validates
+without a database read. It is single-use: consuming it inserts the nonce
+into QRNonce, whose primary key lets only one insert succeed across all
+workers. Called inside the attendance transaction, the insert is undone
+with it, so a failed check-in does not burn the code. Rows are purged once
+the token has expired (see qrcodes.retention).
+"""
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import QRNonce
+
+SALT = 'qrcodes.tokens'
+
+QRToken = namedtuple('QRToken', ['user_id', 'nonce', 'issued_at'])
+
+
+def is_token(value):
+    """Signed tokens contain ':' separators, QRLog ids (UUIDs) never do."""
+    return ':' in value
+
+
+def issue_token(user):
+    """Returns (token, nonce) for a new single-use QR token of the user."""
+    nonce = uuid.uuid4()
+    token = signing.dumps({'u': user.pk, 'n': nonce.hex}, salt=SALT, compress=True)
+    return token, nonce
+
+
+def _load(token, max_age=None):
+    payload = signing.loads(token, salt=SALT, max_age=max_age)
+    # The signature covers '<payload>:<timestamp>', so the timestamp is the signed issue time
+    issued_at = datetime.fromtimestamp(signing.b62_decode(token.rsplit(':', 2)[1]), tz=dt_timezone.utc)
+    try:
+        return QRToken(user_id=int(payload['u']), nonce=uuid.UUID(payload['n']), issued_at=issued_at)
+    except (KeyError, TypeError, ValueError):
+        raise signing.BadSignature("Malformed QR token payload.")
+
+
+def read_token(token, at=None):
+    """
+    Verifies the signature and age of a token and returns its QRToken.
+    The age is checked at `at` (e.g. the time an offline scanner read the
+    code) instead of now when given.
+    Raises signing.SignatureExpired for an expired token and
+    signing.BadSignature for anything else that is not a valid token.
+    """
+    max_age = settings.QRCODE_TTL
+    if at is not None:
+        # signing checks `now - issued_at > max_age`; shift it so the check becomes `at - issued_at > TTL`
+        max_age += (timezone.now() - at).total_seconds()
+    return _load(token, max_age)
+
+
+def consume_nonce(token, at=None):
+    """Marks the token's nonce as used at `at` (default now). Returns False if it was already consumed."""
+    at = at or timezone.now()
+    try:
+        # Savepoint: a duplicate must not break the caller's transaction
+        with transaction.atomic():
+            QRNonce.objects.create(nonce=token.nonce, user_id=token.user_id, consumed_at=at)
+    except IntegrityError:
+        return False
+    return True
+
+
+def token_status(token, user):
+    """
+    {'id', 'expires_at', 'decoded_at'} of a token the user was issued, or None
+    if the value is not a valid token of the user. Only the signature is
+    checked, so an expired token still reports its status; it expires
+    QRCODE_TTL after its signed issue time.
+    """
+    try:
+        token = _load(token)
+    except signing.BadSignature:
+        return None
+    if token.user_id != user.pk:
+        return None
+    return {
+        'id': token.nonce,
+        'expires_at': token.issued_at + timedelta(seconds=settings.QRCODE_TTL),
+        'decoded_at': QRNonce.objects.filter(pk=token.nonce).values_list('consumed_at', flat=True).first(),
+    }
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import QRCodeGenerateView, QRCodeValidateView
+from .views import QRCodeGenerateView, QRCodeValidateView, QRCodeStatusView
 
 # # prefix = "schedules/"
 # urlpatterns = [
@@ -13,4 +13,5 @@ from .views import QRCodeGenerateView, QRCodeValidateView
 urlpatterns = [
     path('', QRCodeGenerateView.as_view(), name="generate-qrcode"),
     path('validate/', QRCodeValidateView.as_view(), name="validate-qrcode"),
+    path('<uuid:qr_id>/status/', QRCodeStatusView.as_view(), name="qrcode-status"),
 ]
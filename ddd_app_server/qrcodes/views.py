@@ -1,6 +1,11 @@
+import time
+
 from django.utils.timezone import now
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.utils.cache import get_conditional_response
 from datetime import timedelta
 
 from rest_framework import permissions, status
@@ -13,8 +18,9 @@ from drf_yasg import openapi
 
 from .models import QRLog
 from common.serializers import ErrorResponseSerializer
-from .serializers import QRLogSerializer
-from common.mixins import BaseResponseMixin
+from .serializers import QRLogSerializer, QRTokenSerializer, QRCodeStatusSerializer
+from . import tokens
+from common.mixins import BaseResponseMixin, ConditionalGetMixin
 from attendances.models import Attendance
 
 # QR 코드 생성 응답 Serializer
@@ -26,7 +32,7 @@ class QRCodeGenerateSuccessResponseSerializer(serializers.Serializer):
 # QR 코드 검증 요청 Serializer
 class QRCodeValidateRequestSerializer(serializers.Serializer):
     qr_string = serializers.CharField(
-        help_text="QR 코드 문자열 (QRLog 레코드의 ID)",
+        help_text="QR 코드 문자열 (QRLog 레코드의 ID 또는 서명된 QR 토큰)",
         required=True,
         allow_blank=False
     )
@@ -54,6 +60,12 @@ class QRLogListSuccessResponseSerializer(serializers.Serializer):
     message = serializers.CharField(default="QR 로그를 성공적으로 조회했습니다.")
     data = QRLogSerializer(many=True)
 
+# QR 코드 상태 응답 Serializer
+class QRCodeStatusSuccessResponseSerializer(serializers.Serializer):
+    code = serializers.IntegerField(default=200)
+    message = serializers.CharField(default="QR 코드 상태를 조회했습니다.")
+    data = QRCodeStatusSerializer()
+
 
 class QRCodeGenerateView(BaseResponseMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -81,7 +93,10 @@ class QRCodeGenerateView(BaseResponseMixin, APIView):
     @swagger_auto_schema(
         tags=["qr"],
         operation_summary="QR 코드 생성",
-        operation_description="레코드의 ID를 사용하여 새로운 QR 코드를 생성합니다. 5분간 유효합니다.",
+        operation_description="""
+        레코드의 ID를 사용하여 새로운 QR 코드를 생성합니다. 5분간 유효합니다.
+        토큰 모드(QRCODE_TOKEN_MODE)에서는 QRLog를 저장하지 않고 서명된 토큰을 qr_string으로 반환합니다.
+        """,
         responses={
             200: QRCodeGenerateSuccessResponseSerializer,
             400: ErrorResponseSerializer,
@@ -91,12 +106,24 @@ class QRCodeGenerateView(BaseResponseMixin, APIView):
         user = request.user
         
         # 만료 시간 정의
-        expires_at = now() + timedelta(minutes=5)
-        
-        # ID를 얻기 위해 먼저 로그 항목 생성
-        qr_log = QRLog.objects.create(user=user, expires_at=expires_at)
-        
-        serializer = QRLogSerializer(qr_log)
+        issued_at = now()
+        expires_at = issued_at + timedelta(seconds=settings.QRCODE_TTL)
+
+        if settings.QRCODE_TOKEN_MODE:
+            # 토큰 모드: DB 쓰기 없이 서명된 토큰 발급
+            token, nonce = tokens.issue_token(user)
+            serializer = QRTokenSerializer({
+                'id': nonce,
+                'user_id': user.pk,
+                'qr_string': token,
+                'created_at': issued_at,
+                'expires_at': expires_at,
+            })
+        else:
+            # ID를 얻기 위해 먼저 로그 항목 생성
+            qr_log = QRLog.objects.create(user=user, expires_at=expires_at)
+            serializer = QRLogSerializer(qr_log)
+
         return self.create_response(
             code=status.HTTP_201_CREATED,
             message="QR 코드가 성공적으로 생성되었습니다.",
@@ -131,11 +158,14 @@ class QRCodeValidateView(BaseResponseMixin, APIView):
                 data={"valid": False}, 
                 status_code=status.HTTP_400_BAD_REQUEST
             )
+
+        if tokens.is_token(qr_id):
+            return self.validate_token(qr_id)
         
         # 기본 키(ID)로 QR 코드 로그 항목 찾기
         try:
             qr_log = QRLog.objects.select_related('user').get(pk=qr_id)
-        except QRLog.DoesNotExist:
+        except (QRLog.DoesNotExist, ValidationError):
             return self.create_response(
                 code=status.HTTP_400_BAD_REQUEST,
                 message="유효하지 않은 QR 코드입니다.",
@@ -162,9 +192,14 @@ class QRCodeValidateView(BaseResponseMixin, APIView):
             )
 
         # 모든 확인을 통과하면 QR 코드가 유효함
-        # 'decoded_at' 타임스탬프를 설정하여 사용됨으로 표시
-        qr_log.decoded_at = now()
-        qr_log.save()
+        # 조건부 UPDATE로 'decoded_at'을 설정하여 사용됨으로 표시 (동시 요청 중 하나만 성공)
+        if not QRLog.objects.consume(qr_log.pk):
+            return self.create_response(
+                code=status.HTTP_410_GONE,
+                message="이미 사용되었거나 만료된 QR 코드입니다.",
+                data={"valid": False},
+                status_code=status.HTTP_410_GONE
+            )
 
         user = qr_log.user
         response_data = {
@@ -179,3 +214,150 @@ class QRCodeValidateView(BaseResponseMixin, APIView):
             data=response_data,
             status_code=status.HTTP_200_OK
         )
+
+    def validate_token(self, value):
+        """서명된 QR 토큰 검증 (토큰 모드): QRLog 조회 없이 서명/만료를 확인하고 nonce를 사용 처리"""
+        try:
+            token = tokens.read_token(value)
+        except signing.SignatureExpired:
+            return self.create_response(
+                code=status.HTTP_410_GONE,
+                message="만료된 QR 코드입니다.",
+                data={"valid": False},
+                status_code=status.HTTP_410_GONE
+            )
+        except signing.BadSignature:
+            return self.create_response(
+                code=status.HTTP_400_BAD_REQUEST,
+                message="유효하지 않은 QR 코드입니다.",
+                data={"valid": False},
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        user = User.objects.filter(pk=token.user_id).only('id', 'username').first()
+        if user is None:
+            return self.create_response(
+                code=status.HTTP_400_BAD_REQUEST,
+                message="유효하지 않은 QR 코드입니다.",
+                data={"valid": False},
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not tokens.consume_nonce(token):
+            return self.create_response(
+                code=status.HTTP_410_GONE,
+                message="이미 사용된 QR 코드입니다.",
+                data={"valid": False},
+                status_code=status.HTTP_410_GONE
+            )
+
+        response_data = {
+            "valid": True,
+            "user_id": user.id,
+            "username": user.username
+        }
+        return self.create_response(
+            code=status.HTTP_200_OK,
+            message="QR 코드가 유효합니다.",
+            data=response_data,
+            status_code=status.HTTP_200_OK
+        )
+
+
+class QRCodeStatusView(ConditionalGetMixin, BaseResponseMixin, APIView):
+    """
+    QR 코드 한 개의 사용 여부를 조회합니다. (롱 폴링)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    @swagger_auto_schema(
+        tags=["qr"],
+        operation_summary="QR 코드 상태 조회 (롱 폴링)",
+        operation_description=f"""
+        생성한 QR 코드의 상태(pending / used / expired)를 조회합니다.
+        timeout(초, 최대 {settings.QRCODE_STATUS_MAX_WAIT})을 주면 상태가 바뀌거나 timeout이 지날 때까지 응답을 보류합니다.
+        - If-None-Match 헤더가 없으면 QR 코드가 pending이 아니게 될 때까지 기다립니다.
+        - 이전 응답의 ETag를 If-None-Match로 전달하면 상태가 그 응답과 달라질 때까지 기다리며, timeout까지 변화가 없으면 304 Not Modified를 반환합니다.
+        토큰 모드에서는 발급 응답의 id(nonce)로 조회하며, 발급 응답의 qr_string을 token으로 함께 전달해야 합니다.
+        """,
+        manual_parameters=[
+            openapi.Parameter('timeout', openapi.IN_QUERY, description=f"최대 대기 시간(초, 0~{settings.QRCODE_STATUS_MAX_WAIT}, 기본 0)", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('token', openapi.IN_QUERY, description="토큰 모드에서 발급받은 qr_string", type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: QRCodeStatusSuccessResponseSerializer,
+            304: "변경 사항 없음 (Not Modified)",
+            400: ErrorResponseSerializer,
+            404: ErrorResponseSerializer,
+        }
+    )
+    def get(self, request, qr_id):
+        try:
+            timeout = float(request.query_params.get('timeout', 0))
+        except ValueError:
+            timeout = -1
+        if not 0 <= timeout <= settings.QRCODE_STATUS_MAX_WAIT:
+            return self.create_response(
+                code=status.HTTP_400_BAD_REQUEST,
+                message=f"timeout은 0 이상 {settings.QRCODE_STATUS_MAX_WAIT} 이하의 숫자여야 합니다.",
+                data=None,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        qr_status = self.get_status(request, qr_id)
+        if qr_status is None:
+            return self.create_response(
+                code=status.HTTP_404_NOT_FOUND,
+                message="QR 코드를 찾을 수 없습니다.",
+                data=None,
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+
+        # 상태가 바뀔 때까지 짧은 PK 조회를 반복하며 대기 (gevent 워커에서는 sleep 동안 다른 요청을 처리)
+        deadline = time.monotonic() + timeout
+        while self.is_unchanged(request, qr_status) and time.monotonic() < deadline:
+            time.sleep(min(settings.QRCODE_STATUS_POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+            qr_status = self.get_status(request, qr_id)
+
+        etag = self.get_status_etag(request, qr_status)
+        not_modified = self.get_not_modified_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = self.create_response(
+            code=status.HTTP_200_OK,
+            message="QR 코드 상태를 조회했습니다.",
+            data=QRCodeStatusSerializer(qr_status).data,
+            status_code=status.HTTP_200_OK
+        )
+        return self.set_validators(response, etag=etag)
+
+    def get_status(self, request, qr_id):
+        """Current status of the requester's QR code, or None if there is no such code."""
+        qr_log = QRLog.objects.filter(pk=qr_id, user=request.user).values('id', 'expires_at', 'decoded_at').first()
+        if qr_log is None:
+            if not settings.QRCODE_TOKEN_MODE:
+                return None
+            # 토큰 모드: id는 토큰의 nonce이며, 함께 전달된 토큰의 서명으로 소유자/만료 시각을 확인
+            qr_log = tokens.token_status(request.query_params.get('token', ''), request.user)
+            if qr_log is None or qr_log['id'] != qr_id:
+                return None
+
+        if qr_log['decoded_at']:
+            qr_log['status'] = 'used'
+        elif qr_log['expires_at'] and now() >= qr_log['expires_at']:
+            qr_log['status'] = 'expired'
+        else:
+            qr_log['status'] = 'pending'
+        return qr_log
+
+    def get_status_etag(self, request, qr_status):
+        return self.get_etag(request, qr_status['status'], qr_status['decoded_at'])
+
+    def is_unchanged(self, request, qr_status):
+        """Whether a long-poll should keep waiting for this status."""
+        if 'If-None-Match' in request.headers:
+            etag = self.get_status_etag(request, qr_status)
+            return get_conditional_response(request, etag=etag) is not None
+        return qr_status['status'] == 'pending'
@@ -1,70 +1,48 @@
 # admin.py
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth import get_user_model
-from .models import Schedule
-from attendances.models import Attendance
+from django.utils.timezone import now
+from .models import AttendanceSyncJob, Schedule
+from .sync_jobs import queue_job
+from attendances.roster import sync_schedule_rosters
 
 User = get_user_model()
 
+# Selections with more schedules than this are queued for the run_attendance_sync_jobs command
+BACKGROUND_SYNC_THRESHOLD = 10
+
+
 # --- New Admin Action ---
 @admin.action(description="Sync attendance for assigned group on selected schedules")
 def sync_attendance_for_group(modeladmin, request, queryset):
     """
     Admin action to create/ensure attendance records for all users
     in the assigned group of the selected schedules.
+    Each schedule takes one anti-join and one bulk insert; large selections
+    are queued as an AttendanceSyncJob for the run_attendance_sync_jobs
+    command, and their progress is shown on the changelist.
     """
-    schedules_processed = 0
-    attendance_created_count = 0
-    schedules_without_group = 0
-
-    for schedule in queryset:
-        if schedule.group:
-            group = schedule.group
-            users_in_group = group.user_set.all()
-            
-            if not users_in_group.exists():
-                # Optional: message if the group has no users
-                # modeladmin.message_user(request, f"Schedule '{schedule.title}' assigned group '{group.name}' has no users.", level='warning')
-                continue # Skip to next schedule if group is empty
-
-            created_for_this_schedule = 0
-            for user in users_in_group:
-                # Skip staff users or users in the "moderator" group
-                is_staff = (user.is_staff or user.groups.filter(name="moderator").exists())
-                if is_staff:
-                    continue
+    schedules = list(queryset.filter(group__isnull=False).only('id', 'title', 'group_id', 'start_time'))
+    schedules_without_group = queryset.filter(group__isnull=True).count()
+    if schedules_without_group:
+        modeladmin.message_user(
+            request, f"Skipped {schedules_without_group} schedule(s) with no assigned group.", level=messages.WARNING
+        )
+    if not schedules:
+        modeladmin.message_user(request, "No schedules selected or no action taken.")
+        return
 
-                # Use get_or_create to add attendance only if it doesn't exist
-                attendance, created = Attendance.objects.get_or_create(
-                    user=user,
-                    schedule=schedule,
-                    defaults={'status': 'tbd'} # Set default status only if created
-                )
-                if created:
-                    created_for_this_schedule += 1
-            
-            if created_for_this_schedule > 0:
-                 attendance_created_count += created_for_this_schedule
-            schedules_processed += 1
-        else:
-            schedules_without_group += 1
-            modeladmin.message_user(request, f"Schedule '{schedule.title}' has no assigned group.", level='warning')
-
-    # --- User Feedback ---
-    message_parts = []
-    if schedules_processed > 0:
-        message_parts.append(f"Processed {schedules_processed} schedule(s) with assigned groups.")
-    if attendance_created_count > 0:
-        message_parts.append(f"Created {attendance_created_count} new attendance record(s).")
-    if schedules_without_group > 0:
-         message_parts.append(f"Skipped {schedules_without_group} schedule(s) with no assigned group.")
-    
-    if not message_parts:
-         message = "No schedules selected or no action taken."
-    else:
-         message = " ".join(message_parts)
+    if len(schedules) > BACKGROUND_SYNC_THRESHOLD:
+        queue_job([schedule.pk for schedule in schedules], user=request.user)
+        modeladmin.message_user(
+            request, f"Queued attendance sync for {len(schedules)} schedule(s); it runs in the background."
+        )
+        return
 
-    modeladmin.message_user(request, message)
+    created = sync_schedule_rosters(schedules, remove=False)
+    modeladmin.message_user(
+        request, f"Processed {len(schedules)} schedule(s) with assigned groups. Created {created} new attendance record(s)."
+    )
 
 
 # --- Updated Schedule Admin ---
@@ -81,3 +59,48 @@ class ScheduleAdmin(admin.ModelAdmin):
 
     actions = [sync_attendance_for_group]
 
+    def changelist_view(self, request, extra_context=None):
+        self.report_sync_jobs(request)
+        return super().changelist_view(request, extra_context)
+
+    def report_sync_jobs(self, request):
+        """Shows the progress of the user's queued attendance syncs; finished ones are reported once."""
+        reported = []
+        for job in AttendanceSyncJob.objects.filter(created_by=request.user, reported_at__isnull=True):
+            if job.status == AttendanceSyncJob.QUEUED:
+                self.message_user(
+                    request,
+                    f"Attendance sync of {job.total} schedule(s) is queued and has not started yet.",
+                    level=messages.INFO,
+                )
+            elif job.status == AttendanceSyncJob.RUNNING:
+                self.message_user(
+                    request,
+                    f"Attendance sync in progress: {job.done}/{job.total} schedule(s), "
+                    f"{job.created} record(s) created so far.",
+                    level=messages.INFO,
+                )
+            elif job.status == AttendanceSyncJob.FINISHED:
+                reported.append(job.pk)
+                self.message_user(
+                    request,
+                    f"Attendance sync finished: processed {job.total} schedule(s), "
+                    f"created {job.created} new attendance record(s).",
+                    level=messages.SUCCESS,
+                )
+            else:
+                reported.append(job.pk)
+                self.message_user(
+                    request,
+                    f"Attendance sync failed after {job.done}/{job.total} schedule(s): {job.error}",
+                    level=messages.ERROR,
+                )
+        if reported:
+            AttendanceSyncJob.objects.filter(pk__in=reported).update(reported_at=now())
+
+
+@admin.register(AttendanceSyncJob)
+class AttendanceSyncJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'done', 'total', 'created', 'created_by', 'created_at', 'updated_at')
+    list_filter = ('status', 'created_at')
+    readonly_fields = ('created_by', 'schedule_ids', 'total', 'done', 'created', 'error', 'created_at', 'updated_at', 'reported_at')
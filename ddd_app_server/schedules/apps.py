@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SchedulesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "schedules"
+
+    def ready(self):
+        import schedules.signals
+        return super().ready()
@@ -0,0 +1,31 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from schedules.sync_jobs import DEFAULT_STALE_AFTER, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the attendance syncs queued from the schedule admin. Runs once (e.g. from cron) "
+        "or, with --watch, keeps polling for new jobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', type=float, metavar='SECONDS', help="Poll for new jobs every SECONDS instead of exiting.")
+        parser.add_argument(
+            '--stale-after', type=int, default=int(DEFAULT_STALE_AFTER.total_seconds()),
+            help="Seconds without progress after which a running job is considered abandoned and resumed.",
+        )
+
+    def handle(self, *args, **options):
+        stale_after = timedelta(seconds=options['stale_after'])
+        while True:
+            finished, failed = run_pending_jobs(stale_after=stale_after)
+            if finished or failed or not options['watch']:
+                style = self.style.ERROR if failed else self.style.SUCCESS
+                self.stdout.write(style(f"Finished {finished} attendance sync job(s), {failed} failed."))
+            if not options['watch']:
+                return
+            time.sleep(options['watch'])
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('profiles', '0004_remove_profile_cohort_id'),
+        ('schedules', '0005_schedule_cohort_alter_schedule_group'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['start_time'], name='schedule_start_time_idx'),
+        ),
+    ]
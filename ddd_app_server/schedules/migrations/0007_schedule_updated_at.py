@@ -0,0 +1,20 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0006_schedule_schedule_start_time_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedule',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='Timestamp when the schedule was last modified.'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('profiles', '0005_memberattribute'),
+        ('schedules', '0007_schedule_updated_at'),
+    ]
+
+    operations = [
+        # Build the composite index before dropping the one it supersedes
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['start_time', 'end_time'], name='schedule_start_end_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='schedule',
+            name='schedule_start_time_idx',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0008_schedule_start_end_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedule',
+            name='finalized_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text="When the remaining 'tbd' attendances were finalized to 'absent'.", null=True),
+        ),
+    ]
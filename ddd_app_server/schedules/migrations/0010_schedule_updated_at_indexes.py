@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('profiles', '0005_memberattribute'),
+        ('schedules', '0009_schedule_finalized_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['updated_at'], name='schedule_updated_idx'),
+        ),
+    ]
@@ -1,17 +1,14 @@
 from django.shortcuts import get_object_or_404
-from django.utils.timezone import now
 from rest_framework.exceptions import NotFound
 from django.contrib.auth.models import User
 from .models import Schedule
+from . import timeline
 
 class CurrentScheduleMixin:
     def get_schedule(self, schedule_id):
         if schedule_id is None or schedule_id == "now":
-            current_time = now()
-            schedule = Schedule.objects.filter(
-                start_time__lte=current_time,
-                end_time__gte=current_time
-            ).first()
+            # 진행 중인 스케줄은 쿼리 없이 타임라인 인덱스에서 조회
+            schedule = timeline.current_schedule()
             if not schedule:
                 raise NotFound(detail="현재 진행 중인 스케줄이 없습니다.")
             return schedule
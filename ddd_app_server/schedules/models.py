@@ -1,6 +1,7 @@
 # schedules/models.py
 import uuid
 from django.db import models
+from django.conf import settings
 from django.contrib.auth.models import Group #, User
 from profiles.models import Cohort
 
@@ -12,15 +13,32 @@ class Schedule(models.Model):
     start_time = models.DateTimeField(help_text="The date and time when the schedule starts.")
     end_time = models.DateTimeField(help_text="The date and time when the schedule ends.")
     created_at = models.DateTimeField(auto_now_add=True, editable=False, help_text="Timestamp when the schedule was created.")
+    updated_at = models.DateTimeField(auto_now=True, help_text="Timestamp when the schedule was last modified.")
+    finalized_at = models.DateTimeField(null=True, blank=True, editable=False, help_text="When the remaining 'tbd' attendances were finalized to 'absent'.")
     group = models.ForeignKey(Group, on_delete=models.SET_NULL, null=True, related_name='schedules', help_text="The group to which this schedule is assigned.")
     cohort = models.ForeignKey(Cohort, on_delete=models.SET_NULL, null=True, blank=True, related_name='schedules')
 
     class Meta:
         ordering = ['start_time', 'title']
+        indexes = [
+            # Time window lookups (start_time <= t <= end_time); the prefix also serves start_time ordering
+            models.Index(fields=['start_time', 'end_time'], name='schedule_start_end_idx'),
+            # Delta sync: rows changed since a watermark
+            models.Index(fields=['updated_at'], name='schedule_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.start_time.strftime('%Y-%m-%d %H:%M')})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the persisted values so signal handlers can tell what changed
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if value is not models.DEFERRED
+        }
+        return instance
+
     # # Example property to easily get assigned users via the group
     # @property
     # def assigned_users_through_group(self):
@@ -30,3 +48,37 @@ class Schedule(models.Model):
     #     return User.objects.none() # Return an empty queryset if no group is assigned
 
 # from django.contrib.auth.models import User
+
+
+class AttendanceSyncJob(models.Model):
+    """
+    A queued admin "Sync attendance" run over many schedules. Jobs are
+    processed by the run_attendance_sync_jobs management command, outside the
+    web workers; progress is written back after every schedule.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (FINISHED, 'Finished'), (FAILED, 'Failed')]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='attendance_sync_jobs')
+    schedule_ids = models.JSONField(help_text="Schedules to sync, in processing order.")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    total = models.PositiveIntegerField(default=0)
+    done = models.PositiveIntegerField(default=0, help_text="Schedules processed so far; a resumed job continues from here.")
+    created = models.PositiveIntegerField(default=0, help_text="Attendance records created so far.")
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, help_text="Last progress update (heartbeat of a running job).")
+    reported_at = models.DateTimeField(null=True, blank=True, help_text="When the outcome was shown to the admin who queued the job.")
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='syncjob_status_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"Attendance sync {self.id} ({self.status}, {self.done}/{self.total})"
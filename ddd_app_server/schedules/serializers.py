@@ -1,17 +1,23 @@
 from rest_framework import serializers
 from .models import Schedule
 from profiles.models import Profile
-from attendances.models import Attendance
-from profiles.serializers import ProfileSummarySerializer
+from attendances.models import Attendance, AttendanceStatusCounter
+from profiles.serializers import ProfileSummarySerializer, PROFILE_SUMMARY_PREFETCH
+from common.serializers import PrefetchListSerializer, SparseFieldsetMixin
 
 
 class AttendanceSummarySerializer(serializers.ModelSerializer):
     profile = serializers.SerializerMethodField()
 
+    prefetch_lookups = {
+        'profile': PROFILE_SUMMARY_PREFETCH,
+    }
+
     class Meta:
         model = Attendance
         fields = ['profile', 'status', 'updated_at', 'method', 'note']
         read_only_fields = fields
+        list_serializer_class = PrefetchListSerializer
 
     def get_profile(self, obj):
         profile = getattr(obj.user, 'profile', None)
@@ -20,13 +26,18 @@ class AttendanceSummarySerializer(serializers.ModelSerializer):
         return None
 
 
-class ScheduleSerializer(serializers.ModelSerializer):
+class ScheduleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     attendances_summary = serializers.SerializerMethodField()
 
+    prefetch_lookups = {
+        'attendances_summary': tuple(f'attendances__{lookup}' for lookup in PROFILE_SUMMARY_PREFETCH),
+    }
+
     class Meta:
         model = Schedule
         fields = ['id', 'title', 'description', 'start_time', 'end_time', 'created_at', 'attendances_summary']
         read_only_fields = ['id', 'created_at', 'attendances_summary']
+        list_serializer_class = PrefetchListSerializer
 
     def get_attendances_summary(self, obj):
         """
@@ -39,3 +50,26 @@ class ScheduleSerializer(serializers.ModelSerializer):
         if data.get('end_time') and data.get('start_time') and data['end_time'] <= data['start_time']:
             raise serializers.ValidationError("종료 시간은 시작 시간보다 이후여야 합니다.")
         return data
+
+
+class ScheduleListSummarySerializer(ScheduleSerializer):
+    """
+    Lean schedule list item (view=summary): per-status attendance counts instead
+    of the full roster. The roster is only embedded when the view passes
+    include_attendances=True in the context.
+    """
+    attendance_counts = serializers.SerializerMethodField()
+
+    class Meta(ScheduleSerializer.Meta):
+        fields = ['id', 'title', 'description', 'start_time', 'end_time', 'created_at', 'attendance_counts', 'attendances_summary']
+        read_only_fields = fields
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.context.get('include_attendances'):
+            self.fields.pop('attendances_summary', None)
+
+    def get_attendance_counts(self, obj):
+        """Counts from the maintained ScheduleAttendanceCounter row (select_related by the view)."""
+        counter = getattr(obj, 'attendance_counter', None)
+        return {field: getattr(counter, field, 0) for field in AttendanceStatusCounter.COUNT_FIELDS}
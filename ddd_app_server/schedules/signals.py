@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Schedule
+from . import timeline
+
+
+@receiver(post_save, sender=Schedule)
+@receiver(post_delete, sender=Schedule)
+def invalidate_timeline(sender, instance, **kwargs):
+    # Again after commit: a lookup in between may have rebuilt it from the old rows
+    timeline.invalidate()
+    transaction.on_commit(timeline.invalidate)
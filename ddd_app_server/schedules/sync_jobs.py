@@ -0,0 +1,93 @@
+# schedules/sync_jobs.py
+"""
+Queued attendance syncs over many schedules (admin "Sync attendance").
+
+The admin action only records an AttendanceSyncJob; run_pending_jobs(),
+driven by the run_attendance_sync_jobs management command, does the work
+outside the web workers. A job is claimed with a conditional UPDATE, so
+several runners never process the same job, and its progress is saved after
+every schedule. A running job whose heartbeat (updated_at) is older than
+`stale_after` belongs to a runner that died; it is claimed again and
+resumes after the last processed schedule. Syncing a schedule is
+idempotent, so repeating one is harmless.
+"""
+import logging
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils.timezone import now
+
+from attendances.roster import sync_schedule_roster
+from .models import AttendanceSyncJob, Schedule
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STALE_AFTER = timedelta(minutes=5)
+
+
+def queue_job(schedule_ids, user=None):
+    """Records a job for the given schedules and returns it."""
+    schedule_ids = [str(schedule_id) for schedule_id in schedule_ids]
+    return AttendanceSyncJob.objects.create(created_by=user, schedule_ids=schedule_ids, total=len(schedule_ids))
+
+
+def claimable(stale_after=DEFAULT_STALE_AFTER):
+    """Queued jobs and running jobs whose runner stopped sending heartbeats."""
+    return AttendanceSyncJob.objects.filter(
+        Q(status=AttendanceSyncJob.QUEUED)
+        | Q(status=AttendanceSyncJob.RUNNING, updated_at__lt=now() - stale_after)
+    )
+
+
+def claim(job):
+    """Marks the job running for this runner. Returns False if another runner got it first."""
+    claimed = AttendanceSyncJob.objects.filter(pk=job.pk, status=job.status, updated_at=job.updated_at).update(
+        status=AttendanceSyncJob.RUNNING, updated_at=now()
+    )
+    return claimed == 1
+
+
+def run_job(job):
+    """Syncs the job's remaining schedules, saving progress after each one. Returns the job's created count."""
+    remaining = job.schedule_ids[job.done:]
+    schedules = {
+        str(schedule.pk): schedule
+        for schedule in Schedule.objects.filter(pk__in=remaining, group__isnull=False).only('id', 'group_id', 'start_time')
+    }
+    created = job.created
+    try:
+        for done, schedule_id in enumerate(remaining, start=job.done + 1):
+            # Deleted schedules and schedules without a group count as processed
+            schedule = schedules.get(schedule_id)
+            if schedule is not None:
+                added_user_ids, _ = sync_schedule_roster(schedule, remove=False)
+                created += len(added_user_ids)
+            AttendanceSyncJob.objects.filter(pk=job.pk).update(done=done, created=created, updated_at=now())
+    except Exception as e:
+        AttendanceSyncJob.objects.filter(pk=job.pk).update(
+            status=AttendanceSyncJob.FAILED, error=str(e), updated_at=now()
+        )
+        raise
+    AttendanceSyncJob.objects.filter(pk=job.pk).update(status=AttendanceSyncJob.FINISHED, updated_at=now())
+    return created
+
+
+def run_pending_jobs(stale_after=DEFAULT_STALE_AFTER):
+    """
+    Claims and runs every claimable job, oldest first. A failed job is
+    recorded and does not stop the others. Returns (finished, failed) counts.
+    """
+    finished = failed = 0
+    for job in claimable(stale_after).order_by('created_at'):
+        if not claim(job):
+            continue
+        job.refresh_from_db()
+        try:
+            created = run_job(job)
+        except Exception:
+            logger.exception(f"Attendance sync job {job.pk} failed.")
+            failed += 1
+            continue
+        logger.info(f"Attendance sync job {job.pk} finished: {job.total} schedule(s), {created} record(s) created.")
+        finished += 1
+    return finished, failed
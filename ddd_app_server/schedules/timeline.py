@@ -0,0 +1,118 @@
+# schedules/timeline.py
+"""
+In-process interval index of schedules for "which schedule is on at time t".
+
+Every check-in asks this question (schedule_id "now", and the QR scan
+without a schedule_id), while schedules change rarely. The index keeps all
+schedules sorted by (start_time, title, id), the Meta.ordering of the
+equivalent query, together with the running maximum of end_time:
+
+    starts[i]        start_time of the i-th schedule
+    max_end[i]       max(end_time of schedules 0..i)
+
+Schedules starting by t are a prefix found by bisection; walking that
+prefix backwards stops as soon as max_end drops below t, because no earlier
+schedule can still be running. Schedules rarely overlap, so a lookup costs
+O(log n) plus the handful of matches, and no query.
+
+The index is built on first use in each worker and dropped on Schedule
+save/delete (see schedules.signals). Those signals only reach the worker
+that made the change, so the index is also rebuilt after
+SCHEDULE_TIMELINE_TTL seconds to pick up changes made by other workers and
+processes (admin, management commands).
+"""
+import threading
+import time
+from bisect import bisect_right
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.timezone import now
+
+from .models import Schedule
+
+_lock = threading.Lock()
+_timeline = None
+_generation = 0
+
+
+class ScheduleTimeline:
+    def __init__(self, field_names, rows, built_at):
+        self.field_names = field_names
+        self.rows = rows
+        self.built_at = built_at
+        start_index = field_names.index('start_time')
+        end_index = field_names.index('end_time')
+        self.id_index = field_names.index('id')
+        self.starts = [row[start_index] for row in rows]
+        self.ends = [row[end_index] for row in rows]
+        self.max_end = []
+        for end in self.ends:
+            self.max_end.append(max(end, self.max_end[-1]) if self.max_end else end)
+
+    @classmethod
+    def build(cls):
+        field_names = [field.attname for field in Schedule._meta.concrete_fields]
+        rows = list(Schedule.objects.order_by('start_time', 'title', 'pk').values_list(*field_names))
+        return cls(field_names, rows, time.monotonic())
+
+    def overlapping(self, at, lead=timedelta(0)):
+        """
+        Positions of the schedules with start_time - lead <= at <= end_time,
+        in (start_time, title) order.
+        """
+        positions = []
+        i = bisect_right(self.starts, at + lead) - 1
+        while i >= 0 and self.max_end[i] >= at:
+            if self.ends[i] >= at:
+                positions.append(i)
+            i -= 1
+        positions.reverse()
+        return positions
+
+    def schedule(self, position):
+        """A fresh Schedule instance for the row, as if loaded by a query."""
+        return Schedule.from_db(DEFAULT_DB_ALIAS, self.field_names, self.rows[position])
+
+    def schedule_id(self, position):
+        return self.rows[position][self.id_index]
+
+
+def get_timeline():
+    """Returns this worker's timeline, building it if missing or older than the TTL."""
+    global _timeline
+    timeline = _timeline
+    if timeline is not None and time.monotonic() - timeline.built_at < settings.SCHEDULE_TIMELINE_TTL:
+        return timeline
+    generation = _generation
+    timeline = ScheduleTimeline.build()
+    # Rows read inside a transaction may never be committed, and a schedule saved
+    # while building may be missing; either way use them for this call only
+    if transaction.get_connection().in_atomic_block:
+        return timeline
+    with _lock:
+        if generation == _generation:
+            _timeline = timeline
+    return timeline
+
+
+def invalidate():
+    """Drops this worker's timeline; the next lookup rebuilds it."""
+    global _timeline, _generation
+    with _lock:
+        _timeline = None
+        _generation += 1
+
+
+def current_schedule(at=None):
+    """The first schedule (by start_time, title) running at `at` (default now), or None."""
+    timeline = get_timeline()
+    positions = timeline.overlapping(at or now())
+    return timeline.schedule(positions[0]) if positions else None
+
+
+def overlapping_schedule_ids(at=None, lead=timedelta(0)):
+    """Ids of the schedules with start_time - lead <= at <= end_time, in (start_time, title) order."""
+    timeline = get_timeline()
+    return [timeline.schedule_id(position) for position in timeline.overlapping(at or now(), lead)]
@@ -1,10 +1,8 @@
-from datetime import datetime
-
 # Python Standard Libraries & Django Imports
 from django.shortcuts import get_object_or_404
 from django.utils.timezone import now
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models import Count, Max, Q
 
 # Third-party Library Imports
 from drf_yasg.utils import swagger_auto_schema
@@ -15,11 +13,14 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 # Local Application/Library Specific Imports
-from common.mixins import BaseResponseMixin
-from common.serializers import ErrorResponseSerializer
+from common.filters import DateRangeFilter, InvalidDateParam
+from common.mixins import BaseResponseMixin, ConditionalGetMixin
+from common.roles import is_staff_or_moderator
+from common.serializers import ErrorResponseSerializer, SPARSE_FIELDSET_PARAMETERS
 from .mixins import CurrentScheduleMixin
 from .models import Schedule
-from .serializers import ScheduleSerializer
+from attendances.models import Attendance
+from .serializers import ScheduleSerializer, ScheduleListSummarySerializer
 from .swagger_docs import (
     ScheduleListResponseSerializer,
     ScheduleCreateResponseSerializer,
@@ -31,8 +32,13 @@ from .swagger_docs import (
 # Get the User model
 User = get_user_model()
 
+VIEW_MODES = ('full', 'summary')
+SUMMARY_INCLUDES = {'attendances'}
+# start_date/end_date 쿼리 파라미터 → 시작 시각의 [start, end) 범위
+START_DATE_RANGE = DateRangeFilter('start_time')
+
 # ── ScheduleListView: 스케줄 목록 조회 및 생성 ──
-class ScheduleListView(BaseResponseMixin, APIView):
+class ScheduleListView(ConditionalGetMixin, BaseResponseMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
     authentication_classes = [JWTAuthentication]
     serializer_class = ScheduleSerializer
@@ -44,24 +50,36 @@ class ScheduleListView(BaseResponseMixin, APIView):
         스케줄 목록을 조회합니다. 
         쿼리 파라미터 'user_id' 또는 'group_id'를 사용하여 특정 사용자 또는 그룹에 할당된 스케줄을 필터링할 수 있습니다.
         스태프 사용자는 모든 스케줄을 대상으로 필터링하며, 일반 사용자는 자신이 접근 가능한 스케줄 내에서 필터링합니다.
+        'view=summary'를 지정하면 출석 명단 대신 상태별 출석 수(attendance_counts)만 반환하며,
+        'include=attendances'를 함께 지정하면 출석 명단(attendances_summary)을 포함합니다.
+        응답의 ETag를 If-None-Match 헤더로 전달하면, 변경 사항이 없을 때 304 Not Modified를 반환합니다.
         """,
         manual_parameters=[
             openapi.Parameter('group_id', openapi.IN_QUERY, description="필터링할 그룹의 ID", type=openapi.TYPE_INTEGER),
             openapi.Parameter('start_date', openapi.IN_QUERY, description="필터링할 시작 날짜 (YYYY-MM-DD)", type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
-            openapi.Parameter('end_date', openapi.IN_QUERY, description="필터링할 종료 날짜 (YYYY-MM-DD)", type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE)
+            openapi.Parameter('end_date', openapi.IN_QUERY, description="필터링할 종료 날짜 (YYYY-MM-DD)", type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
+            openapi.Parameter('view', openapi.IN_QUERY, description="응답 형식 (full: 출석 명단 포함, summary: 상태별 출석 수)", type=openapi.TYPE_STRING, enum=list(VIEW_MODES), default='full'),
+            openapi.Parameter('include', openapi.IN_QUERY, description="summary 응답에 포함할 항목 (attendances)", type=openapi.TYPE_STRING, enum=list(SUMMARY_INCLUDES)),
+            *SPARSE_FIELDSET_PARAMETERS,
         ],
         responses={
             200: ScheduleListResponseSerializer(),
+            304: "변경 사항 없음 (Not Modified)",
             400: ErrorResponseSerializer()
         }
     )
     def get(self, request, *args, **kwargs):
         group_id_filter = request.query_params.get('group_id')
-        start_date_str = request.query_params.get('start_date')
-        end_date_str = request.query_params.get('end_date')
+        view_mode = request.query_params.get('view') or 'full'
+        includes = {value for value in request.query_params.get('include', '').split(',') if value}
+
+        if view_mode not in VIEW_MODES:
+            return self.create_response(400, "잘못된 view 값입니다.", None, status.HTTP_400_BAD_REQUEST)
+        if not includes <= SUMMARY_INCLUDES:
+            return self.create_response(400, "잘못된 include 값입니다.", None, status.HTTP_400_BAD_REQUEST)
 
         # 기본 쿼리셋 결정 (스태프 vs 일반 사용자)
-        is_staff = (request.user.is_staff or request.user.groups.filter(name="moderator").exists())
+        is_staff = is_staff_or_moderator(request.user)
         if is_staff:
             # 스태프 사용자는 모든 스케줄을 기본 대상으로 함
             base_queryset = Schedule.objects.all()
@@ -75,20 +93,54 @@ class ScheduleListView(BaseResponseMixin, APIView):
             if group_id_filter:
                 filtered_queryset = filtered_queryset.filter(assigned_groups__id=int(group_id_filter))
 
-            # 날짜 필터링
-            if start_date_str:
-                start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                filtered_queryset = filtered_queryset.filter(start_time__date__gte=start_date)
-            if end_date_str:
-                end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-                filtered_queryset = filtered_queryset.filter(start_time__date__lte=end_date)
+            # 날짜 필터링 (시작 시각 기준 [start_date, end_date])
+            filtered_queryset = START_DATE_RANGE.filter_queryset(filtered_queryset, request.query_params)
 
+        except InvalidDateParam as e:
+            return self.create_response(400, e.message, e.detail, status.HTTP_400_BAD_REQUEST)
         except ValueError:
             return self.create_response(400, "잘못된 group_id 입니다.", None, status.HTTP_400_BAD_REQUEST)
 
         schedules = filtered_queryset.distinct()
-        serializer = self.serializer_class(schedules, many=True, context={"request": request})
-        return self.create_response(200, "스케줄 목록을 성공적으로 조회했습니다.", serializer.data)
+
+        # 변경 사항이 없으면 직렬화 없이 304 반환
+        etag = self.get_etag(request, is_staff, *self.get_version(schedules))
+        not_modified = self.get_not_modified_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        if view_mode == 'summary':
+            # 상태별 출석 수는 ScheduleAttendanceCounter를 조인하여 조회, 출석 명단은 요청 시에만 일괄 로딩
+            serializer = ScheduleListSummarySerializer(
+                schedules.select_related('attendance_counter'),
+                many=True,
+                context={"request": request, "include_attendances": 'attendances' in includes},
+            )
+        else:
+            serializer = self.serializer_class(schedules, many=True, context={"request": request})
+        response = self.create_response(200, "스케줄 목록을 성공적으로 조회했습니다.", serializer.data)
+        return self.set_validators(response, etag=etag)
+
+    def get_version(self, schedules):
+        """
+        Cheap version of the schedule list and of the attendance summaries nested
+        in it: row counts plus the latest change of every rendered model.
+        """
+        schedule_version = schedules.order_by().aggregate(
+            count=Count('id'),
+            updated_at=Max('updated_at'),
+        )
+        attendance_version = (
+            Attendance.objects
+            .filter(schedule__in=schedules.order_by().values('pk'))
+            .aggregate(
+                count=Count('id'),
+                updated_at=Max('updated_at'),
+                profile=Max('user__profile__updated_at'),
+                member_attribute=Max('user__member_attribute__updated_at'),
+            )
+        )
+        return (*schedule_version.values(), *attendance_version.values())
 
     @swagger_auto_schema(
         tags=["schedule"],
@@ -103,7 +155,7 @@ class ScheduleListView(BaseResponseMixin, APIView):
     )
     def post(self, request, *args, **kwargs):
         # Check for admin or moderator permission manually
-        is_staff = (request.user.is_staff or request.user.groups.filter(name="moderator").exists())
+        is_staff = is_staff_or_moderator(request.user)
         if not is_staff:
             return self.create_response(403, "스케줄 생성 권한이 없습니다.", None, status.HTTP_403_FORBIDDEN)
         
@@ -124,6 +176,7 @@ class ScheduleDetailView(BaseResponseMixin, CurrentScheduleMixin, APIView):
         tags=["schedule"],
         operation_summary="스케줄 상세 조회",
         operation_description="특정 스케줄의 상세 정보를 조회합니다.",
+        manual_parameters=SPARSE_FIELDSET_PARAMETERS,
         responses={200: ScheduleDetailResponseSerializer()}
     )
     def get(self, request, schedule_id, *args, **kwargs):
@@ -143,7 +196,7 @@ class ScheduleDetailView(BaseResponseMixin, CurrentScheduleMixin, APIView):
     )
     def patch(self, request, schedule_id, *args, **kwargs):
         # Check for admin or moderator permission manually
-        is_staff = (request.user.is_staff or request.user.groups.filter(name="moderator").exists())
+        is_staff = is_staff_or_moderator(request.user)
         if not is_staff:
             return self.create_response(403, "스케줄 수정 권한이 없습니다.", None, status.HTTP_403_FORBIDDEN)
         schedule = self.get_schedule(schedule_id)
@@ -161,7 +214,7 @@ class ScheduleDetailView(BaseResponseMixin, CurrentScheduleMixin, APIView):
     # )
     # def delete(self, request, schedule_id, *args, **kwargs):
     #     # Check for admin or moderator permission manually
-    #     is_staff = (request.user.is_staff or request.user.groups.filter(name="moderator").exists())
+    #     is_staff = is_staff_or_moderator(request.user)
     #     if not is_staff:
     #         return self.create_response(403, "스케줄 삭제 권한이 없습니다.", None, status.HTTP_403_FORBIDDEN)
     #     schedule = self.get_schedule(schedule_id)
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import Tombstone
+
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ("model", "object_id", "user_id", "deleted_at")
+    list_filter = ("model", "deleted_at")
+    search_fields = ("object_id",)
+
+admin.site.register(Tombstone, TombstoneAdmin)
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('schedule', 'Schedule'), ('attendance', 'Attendance')], max_length=20)),
+                ('object_id', models.CharField(help_text='Primary key of the deleted row.', max_length=64)),
+                ('user_id', models.IntegerField(blank=True, help_text='Owner of the deleted row (attendances).', null=True)),
+                ('related_id', models.CharField(blank=True, help_text='Schedule of a deleted attendance.', max_length=64, null=True)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['model', 'deleted_at'], name='tombstone_model_deleted_idx')],
+            },
+        ),
+    ]
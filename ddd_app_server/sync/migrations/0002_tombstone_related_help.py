@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tombstone',
+            name='related_id',
+            field=models.CharField(blank=True, help_text='Schedule of a deleted attendance; group of a deleted schedule.', max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# sync/models.py
+from django.db import models
+
+
+# 삭제 기록 (델타 동기화에서 삭제된 행을 알려주기 위한 묘비)
+class Tombstone(models.Model):
+    MODEL_CHOICES = (
+        ('schedule', 'Schedule'),
+        ('attendance', 'Attendance'),
+    )
+
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.CharField(max_length=64, help_text="Primary key of the deleted row.")
+    user_id = models.IntegerField(null=True, blank=True, help_text="Owner of the deleted row (attendances).")
+    related_id = models.CharField(max_length=64, null=True, blank=True, help_text="Schedule of a deleted attendance; group of a deleted schedule.")
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'deleted_at'], name='tombstone_model_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} ({self.deleted_at})"
@@ -0,0 +1,35 @@
+from rest_framework import serializers
+from schedules.models import Schedule
+from attendances.serializers import AttendanceSerializer
+from profiles.serializers import ProfileSerializer
+
+
+class SyncScheduleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Schedule
+        fields = ['id', 'title', 'description', 'start_time', 'end_time', 'created_at', 'updated_at']
+        read_only_fields = fields
+
+
+class SyncScheduleChangesSerializer(serializers.Serializer):
+    updated = SyncScheduleSerializer(many=True)
+    deleted = serializers.ListField(child=serializers.UUIDField(), help_text="삭제되었거나 더 이상 볼 수 없는 스케줄 ID")
+
+
+class SyncAttendanceChangesSerializer(serializers.Serializer):
+    updated = AttendanceSerializer(many=True)
+    deleted = serializers.ListField(child=serializers.UUIDField(), help_text="삭제된 출석 ID")
+
+
+class SyncSerializer(serializers.Serializer):
+    watermark = serializers.CharField(help_text="다음 동기화 요청에 그대로 전달할 값")
+    full = serializers.BooleanField(help_text="true이면 전체 데이터이므로 로컬 데이터를 교체해야 합니다")
+    schedules = SyncScheduleChangesSerializer()
+    attendances = SyncAttendanceChangesSerializer()
+    profile = ProfileSerializer(allow_null=True, help_text="변경되지 않았으면 null")
+
+
+class SyncResponseSerializer(serializers.Serializer):
+    code = serializers.IntegerField(default=200)
+    message = serializers.CharField(default="변경 사항을 성공적으로 조회했습니다.")
+    data = SyncSerializer()
@@ -0,0 +1,28 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+from schedules.models import Schedule
+from attendances.models import Attendance
+from .models import Tombstone
+from .tombstones import record_attendance_tombstones
+
+
+@receiver(post_delete, sender=Schedule)
+def record_schedule_tombstone(sender, instance, **kwargs):
+    # The group decides which members are told about the deletion
+    Tombstone.objects.create(
+        model='schedule',
+        object_id=str(instance.pk),
+        related_id=str(instance.group_id) if instance.group_id else None,
+    )
+
+
+@receiver(pre_delete, sender=Schedule)
+@receiver(pre_delete, sender=User)
+def record_cascaded_attendance_tombstones(sender, instance, **kwargs):
+    # Attendances go by cascade without per-row signals; record them in one insert
+    if sender is Schedule:
+        attendances = Attendance.objects.filter(schedule=instance)
+    else:
+        attendances = Attendance.objects.filter(user=instance)
+    record_attendance_tombstones(attendances.values_list('pk', 'user_id', 'schedule_id'))
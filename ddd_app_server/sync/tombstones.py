@@ -0,0 +1,19 @@
+"""
+Tombstones for deleted attendances.
+
+Attendances are deleted in bulk (roster reconciliation, cascades from a
+deleted schedule or user, admin bulk deletes). A per-row post_delete
+receiver would make Django load every deleted row and insert one
+tombstone per row, so the deletion sites record their tombstones here
+with a single bulk insert instead. Each site passes the (pk, user_id,
+schedule_id) rows it is about to delete, in the same transaction.
+"""
+from .models import Tombstone
+
+
+def record_attendance_tombstones(rows):
+    """Records tombstones for deleted attendances given as (pk, user_id, schedule_id) rows."""
+    Tombstone.objects.bulk_create([
+        Tombstone(model='attendance', object_id=str(pk), user_id=user_id, related_id=str(schedule_id))
+        for pk, user_id, schedule_id in rows
+    ])
@@ -0,0 +1,117 @@
+from django.core import signing
+from django.db.models import Q
+from django.utils.timezone import now
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from rest_framework import permissions, status
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from common.mixins import BaseResponseMixin
+from common.roles import is_staff_or_moderator
+from common.serializers import ErrorResponseSerializer
+from attendances.models import Attendance
+from profiles.models import Profile
+from schedules.models import Schedule
+from .models import Tombstone
+from .serializers import SyncSerializer, SyncResponseSerializer
+from .watermarks import issue_watermark, read_watermark
+
+
+class SyncView(BaseResponseMixin, APIView):
+    """
+    Delta sync for the mobile app: schedules, attendances and the requester's
+    profile created, changed or deleted since the client's watermark.
+    Visibility follows the list endpoints (staff/moderators see every schedule
+    and attendance, members their groups' schedules and their own attendances).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    @swagger_auto_schema(
+        tags=["sync"],
+        operation_summary="델타 동기화",
+        operation_description="""
+        since에 이전 응답의 watermark를 전달하면, 그 이후 생성/수정/삭제된 스케줄, 출석, 프로필만 반환합니다.
+        since가 없거나 너무 오래된 경우 전체 데이터를 반환하며 full이 true로 설정됩니다.
+        응답의 watermark를 저장했다가 다음 요청에 그대로 전달하세요.
+        """,
+        manual_parameters=[
+            openapi.Parameter('since', openapi.IN_QUERY, description="이전 응답의 watermark", type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: SyncResponseSerializer(),
+            400: ErrorResponseSerializer(),
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        since = None
+        if request.query_params.get('since'):
+            try:
+                since = read_watermark(request.query_params['since'])
+            except signing.BadSignature:
+                return self.create_response(400, "잘못된 since 값입니다.", None, status.HTTP_400_BAD_REQUEST)
+
+        # watermark는 조회 전에 발급해야 조회 중에 바뀐 행을 다음 동기화에서 다시 받을 수 있음
+        watermark = issue_watermark(now())
+        is_staff = is_staff_or_moderator(request.user)
+
+        schedules = Schedule.objects.all()
+        attendances = Attendance.objects.all()
+        if not is_staff:
+            schedules = schedules.filter(group__in=request.user.groups.all())
+            attendances = attendances.filter(user=request.user)
+
+        schedule_deleted, attendance_deleted = [], []
+        profile = Profile.objects.filter(user=request.user)
+        if since is not None:
+            attendances = attendances.filter(updated_at__gte=since)
+            schedule_changed = Q(updated_at__gte=since)
+            if not is_staff:
+                # Joining a group makes its existing schedules visible; the new attendance rows mark them
+                schedule_changed |= Q(pk__in=attendances.values('schedule_id'))
+            schedules = schedules.filter(schedule_changed)
+            profile = profile.filter(Q(updated_at__gte=since) | Q(user__member_attribute__updated_at__gte=since))
+            schedule_deleted, attendance_deleted = self.get_deleted(request, since, is_staff)
+
+        data = {
+            'watermark': watermark,
+            'full': since is None,
+            'schedules': {'updated': schedules.order_by('start_time', 'pk'), 'deleted': schedule_deleted},
+            'attendances': {'updated': attendances.order_by('updated_at', 'pk'), 'deleted': attendance_deleted},
+            'profile': profile.select_related('user__member_attribute').first(),
+        }
+        serializer = SyncSerializer(data, context={'request': request})
+        return self.create_response(200, "변경 사항을 성공적으로 조회했습니다.", serializer.data)
+
+    def get_deleted(self, request, since, is_staff):
+        """Ids of schedules and attendances deleted (or, for members, no longer visible) since the watermark."""
+        tombstones = Tombstone.objects.filter(deleted_at__gte=since)
+        schedule_tombstones = tombstones.filter(model='schedule')
+        if not is_staff:
+            # Only schedules of the member's groups; members who left the group since are told
+            # through their deleted attendance rows below
+            group_ids = [str(pk) for pk in request.user.groups.values_list('pk', flat=True)]
+            schedule_tombstones = schedule_tombstones.filter(related_id__in=group_ids)
+        schedule_ids = list(schedule_tombstones.values_list('object_id', flat=True))
+
+        attendance_tombstones = tombstones.filter(model='attendance')
+        if not is_staff:
+            attendance_tombstones = attendance_tombstones.filter(user_id=request.user.pk)
+        attendance_ids = []
+        removed_from_schedule_ids = set()
+        for object_id, schedule_id in attendance_tombstones.values_list('object_id', 'related_id'):
+            attendance_ids.append(object_id)
+            removed_from_schedule_ids.add(schedule_id)
+
+        if not is_staff and removed_from_schedule_ids:
+            # A member dropped from a schedule's roster (left the group) can no longer see that schedule
+            visible = Schedule.objects.filter(
+                pk__in=removed_from_schedule_ids, group__in=request.user.groups.all()
+            ).values_list('pk', flat=True)
+            visible_ids = {str(pk) for pk in visible}
+            schedule_ids.extend(
+                schedule_id for schedule_id in removed_from_schedule_ids if schedule_id not in visible_ids
+            )
+        return list(dict.fromkeys(schedule_ids)), attendance_ids
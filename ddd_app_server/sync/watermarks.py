@@ -0,0 +1,37 @@
+"""
+Opaque delta-sync watermarks.
+
+A watermark is a signed server timestamp. Clients store it and send it
+back unchanged; changes are then read from slightly before that time
+(WATERMARK_OVERLAP), because a row stamped just before the watermark may
+only have committed after it. Re-sent rows are harmless since clients
+apply them as upserts.
+"""
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.utils.timezone import now
+
+SALT = 'sync.watermark'
+WATERMARK_OVERLAP = timedelta(seconds=5)
+
+
+def issue_watermark(at=None):
+    return signing.dumps({'t': (at or now()).isoformat()}, salt=SALT)
+
+
+def read_watermark(watermark):
+    """
+    Returns the time to read changes from, or None when the watermark is
+    older than the tombstone retention and the client needs a full sync.
+    Raises signing.BadSignature for a watermark this server did not issue.
+    """
+    payload = signing.loads(watermark, salt=SALT)
+    try:
+        issued_at = datetime.fromisoformat(payload['t'])
+    except (KeyError, TypeError, ValueError):
+        raise signing.BadSignature("Malformed sync watermark.")
+    if issued_at < now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+        return None
+    return issued_at - WATERMARK_OVERLAP